@@ -0,0 +1,32 @@
+from __future__ import annotations
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    프로세스(워커) 안에서만 쓰는 만료 시간 기반 dict 캐시
+
+    - 값마다 monotonic 기준 만료 시각을 함께 저장, 조회 시 지났으면 버림
+    - None은 "캐시 없음"과 구분되지 않으므로 저장하지 않는 것을 전제로 함
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        hit = self._data.get(key)
+        if hit is None:
+            return None
+        expires_at, value = hit
+        if expires_at < time.monotonic():
+            self._data.pop(key, None)
+            return None
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self) -> None:
+        self._data.clear()
@@ -0,0 +1,36 @@
+from __future__ import annotations
+import hashlib
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Mapping, Tuple
+
+
+def spec_fingerprint(specs: Mapping[str, Any]) -> str:
+    """
+    스펙 딕셔너리로부터 SKU 식별용 fingerprint 생성 (SKU 생성 파이프라인과 조회 CRUD 공용)
+
+    - 키로 정렬해 "k:v|k2:v2|..." 를 만든 뒤 sha256 앞 32자
+    - 같은 스펙이면 항상 같은 fingerprint (저장된 sku.fingerprint와 호환)
+
+    Args:
+        specs: {'model_series':'iPhone 13','color':'Blue','capacity_gb':'256', ...}
+
+    Returns:
+        32자리 해시 문자열
+    """
+    # 키는 유일하므로 키만으로 정렬 (값 비교 불필요)
+    return _hash_spec_items(tuple(sorted(specs.items(), key=itemgetter(0))))
+
+
+@lru_cache(maxsize=8192)
+def _hash_spec_items(items: Tuple[Tuple[str, Any], ...]) -> str:
+    # 같은 스펙 조합이 반복되므로 해시 결과를 메모이즈 (정렬된 (키, 값) 튜플이 캐시 키)
+    # "k:v|k2:v2" 를 문자열 join 없이 바이트 버퍼에 바로 씀
+    buf = bytearray()
+    for k, v in items:
+        if buf:
+            buf.append(0x7C)  # '|'
+        buf += str(k).encode("utf-8")
+        buf.append(0x3A)  # ':'
+        buf += str(v).encode("utf-8")
+    return hashlib.sha256(buf).hexdigest()[:32]
@@ -1,18 +1,25 @@
 # app/core/logging.py
 from __future__ import annotations
 import logging
+import queue
 from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Optional
 from app.core.config import get_settings
 
+_listener: Optional[QueueListener] = None
+
 def setup_logging() -> None:
     """
     프로젝트 전역 로깅 설정을 초기화한다.
     - 콘솔 스트림 핸들러
-    - 회전 파일 핸들러 (logs/app.log)
+    - 회전 파일 핸들러 (logs/app.log) — QueueListener 스레드에서 기록
     - uvicorn / sqlalchemy 로거 레벨 정렬
     """
+    global _listener
     settings = get_settings()
+    level = getattr(settings, "LOG_LEVEL", "INFO")
     log_dir = Path("logs"); log_dir.mkdir(parents=True, exist_ok=True)
 
     dictConfig({
@@ -30,23 +37,14 @@ def setup_logging() -> None:
         "handlers": {
             "console": {
                 "class": "logging.StreamHandler",
-                "level": settings.LOG_LEVEL if hasattr(settings, "LOG_LEVEL") else "INFO",
-                "formatter": "default",
-            },
-            "file": {
-                "class": "logging.handlers.RotatingFileHandler",
-                "level": settings.LOG_LEVEL if hasattr(settings, "LOG_LEVEL") else "INFO",
+                "level": level,
                 "formatter": "default",
-                "filename": str(log_dir / "app.log"),
-                "maxBytes": 5 * 1024 * 1024,
-                "backupCount": 5,
-                "encoding": "utf-8",
             },
         },
         "loggers": {
             "": {  # root
-                "handlers": ["console", "file"],
-                "level": settings.LOG_LEVEL if hasattr(settings, "LOG_LEVEL") else "INFO",
+                "handlers": ["console"],
+                "level": level,
             },
             "uvicorn": {"level": "INFO"},
             "uvicorn.error": {"level": "INFO"},
@@ -56,6 +54,34 @@ def setup_logging() -> None:
         },
     })
 
+    # 파일 I/O는 호출 스레드가 아닌 QueueListener 스레드에서 처리
+    file_handler = RotatingFileHandler(
+        log_dir / "app.log",
+        maxBytes=5 * 1024 * 1024,
+        backupCount=5,
+        encoding="utf-8",
+        delay=True,
+    )
+    file_handler.setLevel(level)
+    file_handler.setFormatter(logging.Formatter(
+        "%(asctime)s | %(levelname)s | %(name)s | %(message)s", "%Y-%m-%d %H:%M:%S"
+    ))
+
+    shutdown_logging()
+    log_queue: queue.Queue = queue.Queue(-1)
+    logging.getLogger().addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+
+def shutdown_logging() -> None:
+    """QueueListener를 멈추고 남은 로그를 파일로 flush."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for h in _listener.handlers:
+            h.close()
+        _listener = None
+
 def get_logger(name: str) -> logging.Logger:
     """모듈에서 가져다 쓰는 헬퍼."""
     return logging.getLogger(name)
@@ -1,37 +1,157 @@
 from __future__ import annotations
 import asyncio
-from typing import Optional
+from typing import IO, Optional
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
 from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.db.crud import invalidate_sku_cache, invalidate_stats_cache
+from app.db.session import SQLALCHEMY_DATABASE_URL, SessionLocal, engine
+from app.services.analytics import invalidate_lookup_cache
+
+settings = get_settings()
+logger = get_logger(__name__)
 
 _scheduler: Optional[AsyncIOScheduler] = None
+_lock_file: Optional[IO] = None
+_lock_conn: Optional[AsyncConnection] = None
+_lock_engine: Optional[AsyncEngine] = None
+
+# fcntl은 POSIX 전용 - Windows에서도 앱 임포트가 깨지지 않도록 선택적으로 로드
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# 여러 워커/호스트/컨테이너 중 스케줄러는 하나만 돌도록 잡는 Postgres advisory lock 키
+SCHED_ADVISORY_LOCK_KEY = 0x486F774D  # "HowM"
+
+def _jobstore_url() -> str:
+    # 잡스토어는 동기 엔진을 쓰므로 async 드라이버 표기를 뺀다
+    return SQLALCHEMY_DATABASE_URL.replace("+aiosqlite", "").replace("+asyncpg", "")
+
+async def _acquire_lock() -> bool:
+    """
+    스케줄러 소유권 획득.
+    - Postgres: 세션 단위 advisory lock (호스트/컨테이너가 달라도 하나만 획득)
+      풀 밖의 전용 커넥션을 AUTOCOMMIT으로 열어 트랜잭션 없이 쥐고 있다가 종료 시 명시적으로 해제
+      (pgbouncer를 쓰면 SCHED_LOCK_DATABASE_URL로 Postgres에 직접 붙어야 락이 커넥션에 고정됨)
+    - 그 외(SQLite 로컬 개발): 같은 호스트 안에서만 유효한 파일 락, fcntl 없는 OS는 락 없이 진행
+    """
+    global _lock_conn, _lock_engine, _lock_file
+    if engine.dialect.name == "postgresql":
+        url = settings.SCHED_LOCK_DATABASE_URL or SQLALCHEMY_DATABASE_URL
+        connect_args = {}
+        if make_url(url).get_driver_name() == "asyncpg":
+            # 락 한 번만 쓰는 커넥션이라 prepared statement 캐시가 필요 없음 (pgbouncer 경유 시 충돌 방지)
+            connect_args = {"statement_cache_size": 0}
+        lock_engine = create_async_engine(
+            url, poolclass=NullPool, isolation_level="AUTOCOMMIT", connect_args=connect_args,
+        )
+        conn = await lock_engine.connect()
+        got = (await conn.execute(
+            text("SELECT pg_try_advisory_lock(:k)"), {"k": SCHED_ADVISORY_LOCK_KEY}
+        )).scalar()
+        if not got:
+            await conn.close()
+            await lock_engine.dispose()
+            return False
+        _lock_conn, _lock_engine = conn, lock_engine
+        return True
+
+    if fcntl is None:
+        return True
+    f = open(settings.SCHED_LOCK_PATH, "w")
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return False
+    _lock_file = f
+    return True
+
+async def _release_lock():
+    global _lock_conn, _lock_engine, _lock_file
+    if _lock_conn is not None:
+        try:
+            await _lock_conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": SCHED_ADVISORY_LOCK_KEY})
+        finally:
+            # 커넥션이 닫혀도 세션 락은 풀림
+            await _lock_conn.close()
+            await _lock_engine.dispose()
+            _lock_conn = _lock_engine = None
+    if _lock_file:
+        fcntl.flock(_lock_file, fcntl.LOCK_UN)
+        _lock_file.close()
+        _lock_file = None
 
 async def job_crawl_daangn():
     # 여기에 실제 크롤러 호출 로직
     # 예: await crawl_all()
     print("[sched] run daangn")
 
-def start_scheduler():
+async def update_sku_and_stats():
+    """
+    SKU/통계 갱신 잡.
+    - 동기(subprocess) SKU 생성은 스레드로 넘겨 루프를 막지 않음
+    - 새 price_stats로 price_stats_latest(요약/지역분석 조회용)를 갱신
+    - 끝나면 이 워커의 조회 캐시를 비움
+    """
+    from tasks.sku_generator import run_sku_generation
+    from app.services.sku_pipline import refresh_price_stats_latest
+
+    await asyncio.to_thread(run_sku_generation)
+    async with SessionLocal() as session:
+        await refresh_price_stats_latest(session)
+        await session.commit()
+    # price_stats가 새로 적재됐으니 이 워커의 요약 캐시는 버림
+    invalidate_stats_cache()
+    # SKU가 다시 생성됐을 수 있으므로 이 워커의 sku_id 캐시도 비움
+    invalidate_sku_cache()
+    # SKU 생성 중 옵션이 추가됐을 수 있으므로 option_id/region_id 캐시도 비움
+    invalidate_lookup_cache()
+    logger.info("[sched] sku/stats updated")
+
+async def start_scheduler():
     global _scheduler
     if _scheduler and _scheduler.running:
         return
-    settings = get_settings()
-    _scheduler = AsyncIOScheduler(timezone="Asia/Seoul")
+    if not await _acquire_lock():
+        logger.info("[sched] another worker owns the scheduler, skip")
+        return
+    _scheduler = AsyncIOScheduler(
+        timezone="Asia/Seoul",
+        # 재시작해도 밀린 잡이 사라지지 않도록 DB에 잡을 저장
+        jobstores={"default": SQLAlchemyJobStore(url=_jobstore_url())},
+        # 밀린 실행은 1회로 합치고, 같은 잡이 겹쳐 돌지 않도록
+        job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": 600},
+    )
 
     if settings.SCHED_ENABLE:
         # 24시간마다 전체 수집 예시 (settings에서 cron 문자열 가져옴)
         _scheduler.add_job(
             job_crawl_daangn,
-            CronTrigger.from_crontab(settings.SCHED_CRON_DAANGN)
+            CronTrigger.from_crontab(settings.SCHED_CRON_DAANGN),
+            id="crawl_daangn",
+            replace_existing=True,
+        )
+        _scheduler.add_job(
+            update_sku_and_stats,
+            CronTrigger.from_crontab(settings.SCHED_CRON_STATS),
+            id="update_sku_and_stats",
+            replace_existing=True,
         )
-        # 필요 시 다른 잡도 등록
-        # _scheduler.add_job(...)
 
     _scheduler.start()
 
-def shutdown_scheduler():
+async def shutdown_scheduler():
     global _scheduler
     if _scheduler and _scheduler.running:
         _scheduler.shutdown(wait=False)
         _scheduler = None
+    await _release_lock()
@@ -1,14 +1,24 @@
 # app/crawlers/bunjang.py
-from typing import AsyncIterator, Sequence
+from typing import AsyncIterator, List, Optional, Sequence
 import asyncio
+import logging
+import math
+import random
 import httpx
-from urllib.parse import quote
+import orjson
+from pydantic import ValidationError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 
+from app.core.config import get_settings
+from app.core.logging import get_logger
 from app.schemas.items import RawItem
 from app.schemas.common import MarketSource
 
+log = get_logger(__name__)
+
 # ====== Constants & Settings ======
 API_BASE_URL = "https://api.bunjang.co.kr/api/1/find_v2.json"
+URL_PREFIX = "https://m.bunjang.co.kr/products/"
 USER_AGENT = (
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
     "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
@@ -19,7 +29,29 @@ HEADERS = {
     "Accept-Language": "ko-KR,ko;q=0.9",
 }
 DEFAULT_KEYWORDS = ["아이폰", "아이패드", "맥북", "애플워치", "에어팟"]
+# Keyword -> category_id (same mapping as the Daangn scraper); other queries fall back to CATEGORY_IPHONE
+CATEGORY_MAP = {"아이폰": 1, "아이패드": 2, "맥북": 3, "애플워치": 4, "에어팟": 5}
 LIMIT_PER_PAGE = 96  # Bunjang API returns about 96 items per page
+PAGE_CONCURRENCY = 4  # Max in-flight page requests per search
+
+# ====== HTTP Helpers ======
+@retry(
+    stop=stop_after_attempt(4),
+    wait=wait_exponential_jitter(initial=0.5, max=8),
+    retry=retry_if_exception_type((httpx.TransportError, httpx.HTTPStatusError)),
+    reraise=True,
+)
+async def _get_json(client: httpx.AsyncClient, params: dict) -> dict:
+    """
+    GETs one API page. 429/5xx and transport errors raise (and are retried with backoff);
+    any other 4xx returns an empty dict so the caller treats the page as empty.
+    """
+    resp = await client.get(API_BASE_URL, params=params)
+    if resp.status_code == 429 or resp.status_code >= 500:
+        resp.raise_for_status()
+    if resp.status_code >= 400:
+        return {}
+    return orjson.loads(resp.content)
 
 # ====== Scraper Implementation ======
 class BunjangScraper:
@@ -29,78 +61,164 @@ class BunjangScraper:
     """
     source = MarketSource.bunjang
 
-    async def search(self, query: str, limit: int = 100) -> AsyncIterator[RawItem]:
+    def __init__(self) -> None:
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "BunjangScraper":
+        # One pooled client shared by every page and keyword (keep-alive + TLS reuse)
+        self._client = httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=20.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=40, keepalive_expiry=30),
+        )
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _fetch_page(self, client: httpx.AsyncClient, base_params: dict, page: int,
+                          sem: asyncio.Semaphore) -> Optional[List[dict]]:
         """
-        Asynchronously searches for products on Bunjang and yields RawItem objects.
+        Fetches one result page. Returns the product list ([] when the page is empty),
+        or None when the request failed.
+        """
+        params = {**base_params, "page": page}
+        async with sem:
+            await asyncio.sleep(random.uniform(0.1, 0.3))  # Be nice to the API
+            try:
+                data = await _get_json(client, params)
+            except (httpx.RequestError, httpx.HTTPStatusError) as e:
+                log.warning("Bunjang API request failed: %s", e)
+                return None
+
+        if data.get("result") != "success":
+            return []
+        return data.get("list") or []
+
+    async def search_pages(self, query: str, limit: int = 100) -> AsyncIterator[List[RawItem]]:
+        """
+        Asynchronously searches for products on Bunjang and yields one list of RawItem per page.
+        Pages are fetched concurrently (bounded by PAGE_CONCURRENCY) and yielded in page order.
+        Uses the shared client when entered via `async with`, otherwise a per-call client.
         """
         page = 0
         items_collected = 0
+        sem = asyncio.Semaphore(PAGE_CONCURRENCY)
+        category_id = CATEGORY_MAP.get(query, get_settings().CATEGORY_IPHONE)
+        # Keyword-invariant query params, built once per search
+        base_params = {
+            "q": query,
+            "order": "score",
+            "n": LIMIT_PER_PAGE,
+            "req_ref": "search",
+            "stat_device": "w",
+            "version": "5",
+        }
 
-        async with httpx.AsyncClient(headers=HEADERS, timeout=20.0) as client:
+        client = self._client
+        owns_client = client is None
+        if owns_client:
+            client = httpx.AsyncClient(headers=HEADERS, timeout=20.0)
+
+        try:
             while items_collected < limit:
-                params = {
-                    "q": query,
-                    "order": "score",
-                    "page": page,
-                    "n": LIMIT_PER_PAGE,
-                    "req_ref": "search",
-                    "stat_device": "w",
-                    "version": "5",
-                }
-
-                try:
-                    resp = await client.get(API_BASE_URL, params=params)
-                    resp.raise_for_status()
-                    data = resp.json()
-                except (httpx.RequestError, httpx.HTTPStatusError) as e:
-                    print(f"Bunjang API request failed: {e}")
-                    break
+                pages_needed = math.ceil((limit - items_collected) / LIMIT_PER_PAGE)
+                batch = range(page, page + pages_needed)
+                pages = await asyncio.gather(*(self._fetch_page(client, base_params, p, sem) for p in batch))
+                page += pages_needed
 
-                if data.get("result") != "success" or not data.get("list"):
-                    # No more items or an API error message
-                    break
+                exhausted = False
+                for page_no, products in zip(batch, pages):
+                    if not products:
+                        # Request failed, no more items, or an API error message
+                        exhausted = True
+                        break
+
+                    page_items: List[RawItem] = []
+                    for item in products:
+                        if items_collected >= limit:
+                            break
+
+                        # Filter out ads and non-product listings
+                        if item.get("ad") or item.get("type") != "PRODUCT":
+                            continue
 
-                for item in data["list"]:
+                        pid = item.get("pid")
+                        if not pid:
+                            continue
+
+                        try:
+                            price = int(item.get("price"))
+                        except (TypeError, ValueError):
+                            # No numeric price (e.g. "ask for price"): unusable for price stats
+                            continue
+
+                        # Parse location
+                        location_str = item.get("location")
+                        sd, sgg, emd = None, None, None
+                        if location_str:
+                            parts = location_str.strip().split()
+                            if len(parts) >= 1:
+                                sd = parts[0]
+                            if len(parts) >= 2:
+                                sgg = parts[1]
+                            if len(parts) >= 3:
+                                emd = " ".join(parts[2:])
+
+                        if log.isEnabledFor(logging.DEBUG):
+                            log.debug("(%d/%d) %s / %s / %s", items_collected + 1, limit, item.get("name", ""), price, location_str)
+
+                        try:
+                            raw = RawItem(
+                                source=self.source,
+                                external_id=str(pid),
+                                category_id=category_id,
+                                title=item.get("name", ""),
+                                price=price,
+                                url=URL_PREFIX + str(pid),
+                                sd=sd,
+                                sgg=sgg,
+                                emd=emd,
+                            )
+                        except ValidationError as e:
+                            log.warning("[%s] invalid item %s skipped: %s", query, pid, e)
+                            continue
+                        page_items.append(raw)
+                        items_collected += 1
+
+                    log.info("[%s] page %d: %d listed, %d collected", query, page_no, len(products), items_collected)
+                    if page_items:
+                        yield page_items
                     if items_collected >= limit:
                         break
 
-                    # Filter out ads and non-product listings
-                    if item.get("ad") or item.get("type") != "PRODUCT":
-                        continue
-
-                    pid = item.get("pid")
-                    if not pid:
-                        continue
-
-                    price_str = item.get("price", "0")
-                    
-                    # Parse location
-                    location_str = item.get("location")
-                    sd, sgg, emd = None, None, None
-                    if location_str:
-                        parts = location_str.strip().split()
-                        if len(parts) >= 1:
-                            sd = parts[0]
-                        if len(parts) >= 2:
-                            sgg = parts[1]
-                        if len(parts) >= 3:
-                            emd = " ".join(parts[2:])
-
-                    yield RawItem(
-                        source=self.source,
-                        external_id=pid,
-                        title=item.get("name", ""),
-                        price_text=price_str,
-                        price=int(price_str) if price_str.isdigit() else None,
-                        url=f"https://m.bunjang.co.kr/products/{pid}",
-                        sd=sd,
-                        sgg=sgg,
-                        emd=emd,
-                    )
-                    items_collected += 1
-
-                page += 1
-                await asyncio.sleep(0.5) # Be nice to the API
+                if exhausted:
+                    break
+        finally:
+            if owns_client:
+                await client.aclose()
+
+    async def search(self, query: str, limit: int = 100) -> AsyncIterator[RawItem]:
+        """
+        Item-at-a-time view of search_pages, kept for the Scraper protocol.
+        """
+        async for page_items in self.search_pages(query, limit=limit):
+            for item in page_items:
+                yield item
+
+    async def crawl_keyword_pages(
+        self,
+        keywords: Sequence[str] = DEFAULT_KEYWORDS,
+        limit_per_keyword: int = 100,
+    ) -> AsyncIterator[List[RawItem]]:
+        """
+        Crawls multiple keywords in sequence, yielding one list of RawItem per page.
+        """
+        for kw in keywords:
+            async for page_items in self.search_pages(kw, limit=limit_per_keyword):
+                yield page_items
 
     async def crawl_keywords(
         self,
@@ -110,6 +228,6 @@ class BunjangScraper:
         """
         Crawls multiple keywords in sequence.
         """
-        for kw in keywords:
-            async for item in self.search(kw, limit=limit_per_keyword):
+        async for page_items in self.crawl_keyword_pages(keywords, limit_per_keyword):
+            for item in page_items:
                 yield item
\ No newline at end of file
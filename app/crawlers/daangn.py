@@ -1,19 +1,54 @@
-from typing import Iterable, AsyncIterator, List, Tuple, Optional, Sequence
-import asyncio, random, re
+from typing import Iterable, AsyncIterator, Dict, List, Tuple, Optional, Sequence
+import asyncio, os, random, re, time
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from urllib.parse import urljoin, urlparse, parse_qs, unquote, quote
 
+import httpx
+import orjson
+from aiolimiter import AsyncLimiter
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from pydantic import ValidationError
+from selectolax.parser import HTMLParser
 
+from app.core.config import get_settings
+from app.core.logging import get_logger
 from app.schemas.items import RawItem
 from app.schemas.common import MarketSource
+from app.services.ingest import parse_price_to_int
+
+log = get_logger(__name__)
+
+# fcntl은 POSIX 전용 - 없으면 프로필 슬롯 락 대신 프로세스별 디렉터리 사용
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
 
 # ====== 상수/설정 ======
 BASE = "https://www.daangn.com"
 HEADLESS = True
-CONCURRENCY = 4
+# 크롤링에 필요 없는 Chromium 기능(확장/동기화/번역/백그라운드 통신)을 꺼서 메모리·기동 시간 절약
+CHROMIUM_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-translate",
+    "--metrics-recording-only",
+]
+VIEWPORT = {"width": 1280, "height": 800}
+PW_PROFILE_SLOTS = 8  # PW_CACHE_ROOT 아래 고정 프로필 개수 (동시에 돌 수 있는 스트림 수 상한)
+GU_CONCURRENCY = 3
+DONG_CONCURRENCY = 6
+DETAIL_CONCURRENCY = 16  # 상세 페이지는 HTTP로 가져오므로 더 넓게
+# 요청마다 랜덤 sleep 대신 daangn.com 으로 가는 HTTP 요청 전체를 초당 10건으로 제한
+DETAIL_RATE_LIMITER = AsyncLimiter(10, 1)
 MAX_SCROLL_ROUNDS = 2
 SCROLL_PAUSE = (0.6, 1.0)
 MAX_PAGES = 30
+FALLBACK_PAGE_BUDGET_S = 8.0  # page=N 폴백에 쓰는 동당 최대 시간(초)
 USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
               "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140 Safari/537.36")
 
@@ -26,67 +61,113 @@ SEOUL_GU = [
 
 # 키워드 기본값(아이폰/아이패드/맥북/애플워치/에어팟)
 DEFAULT_KEYWORDS = ["아이폰", "아이패드", "맥북", "애플워치", "에어팟"]
+# 키워드 → category_id (crawl/crawl_dg.py의 CATEGORY_MAP과 동일). 목록에 없는 검색어는 CATEGORY_IPHONE
+CATEGORY_MAP: Dict[str, int] = {"아이폰": 1, "아이패드": 2, "맥북": 3, "애플워치": 4, "에어팟": 5}
 
 # 선택자 (원본 로직 기반)  :contentReference[oaicite:1]{index=1}
 TITLE_SELECTORS = ["h1"]
 PRICE_SELECTORS = ["h3"]
-TIME_SELECTORS  = ["time[datetime]", "time"]
 LIST_LINK_SELECTOR = 'div[data-gtm="search_article"] a'
 PRIORITY_SELECTORS = ['a[data-gtm="search_article"]', "a[href*='/articles/']"]
+MORE_BUTTON_SELECTORS = [
+    "button:has-text('더보기')","button:has-text('더 불러오기')",
+    "a.load-more",".load-more","button.load-more","button#more","a[role='button']"
+]
+HREFS_JS = "els => els.map(e => e.href).filter(Boolean)"
+_ARTICLE_ID_RE = re.compile(r"/articles/(\d+)")
+
+# networkidle 대신 domcontentloaded 후 필요한 요소만 기다린다
+ARTICLE_LINK_SELECTOR = "a[href*='/articles/']"
+DONG_LINK_SELECTOR = "a[href*='?in=']"
+SELECTOR_WAIT_MS = 3000
+
+# 목록 페이지 JSON 로더 (Remix _data). 매물 URL: /kr/buy-sell/<slug>-<id>/ 또는 /articles/<id>
+LIST_API_PARAMS = {"_data": "routes/kr.buy-sell._index"}
+ARTICLE_URL_PAT = re.compile(
+    r"^(?:https://www\.daangn\.com)?/(?:kr/buy-sell/[^/?#]*-[a-z0-9]{6,}|articles/\d+)/?$", re.IGNORECASE
+)
+
+# 컨텍스트 단위로 막을 리소스/트래커 (페이지마다 route 등록하지 않음)
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "stylesheet", "font", "media"})
+BLOCKED_URL_PAT = re.compile(r"google-analytics|googletagmanager|doubleclick|facebook\.net|hotjar")
 
 
 # ====== 유틸 ======
+# 시/구/키워드는 반복되므로 퍼센트 인코딩 결과를 캐시
+_qquote = lru_cache(maxsize=1024)(quote)
+
+async def _block_route(route, request):
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or BLOCKED_URL_PAT.search(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+@asynccontextmanager
+async def _profile_dir(root: str):
+    """
+    PW_CACHE_ROOT/daangn-0..N 중 비어 있는 고정 프로필 디렉터리를 잡아 빌려준다.
+    Chromium은 user-data-dir 하나를 한 프로세스만 쓸 수 있으므로 슬롯마다 파일 락으로 독점하고,
+    디렉터리는 지우지 않아 HTTP/JS 캐시가 다음 실행(재기동 포함)까지 남는다.
+    """
+    os.makedirs(root, exist_ok=True)
+    if fcntl is None:
+        # 파일 락이 없는 OS: 프로세스별 디렉터리 (같은 프로세스 안에서는 실행 간 재사용)
+        yield os.path.join(root, f"daangn-pid{os.getpid()}")
+        return
+    for slot in range(PW_PROFILE_SLOTS):
+        f = open(os.path.join(root, f"daangn-{slot}.lock"), "w")
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            continue
+        try:
+            yield os.path.join(root, f"daangn-{slot}")
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+            f.close()
+        return
+    raise RuntimeError(f"no free Playwright profile under {root} ({PW_PROFILE_SLOTS} in use)")
+
 def _extract_external_id(url: str) -> str:
     # /articles/123456789 -> 123456789, 없으면 URL 전체
-    m = re.search(r"/articles/(\d+)", url)
+    m = _ARTICLE_ID_RE.search(url)
     return m.group(1) if m else url
 
-async def _try_selectors_get_text(page, selectors: List[str]) -> str:
+async def _wait_for(page, selector: str, timeout: int = SELECTOR_WAIT_MS) -> bool:
+    try:
+        await page.wait_for_selector(selector, timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+def _css_first_text(tree: HTMLParser, selectors: List[str]) -> str:
     for sel in selectors:
-        try:
-            el = await page.query_selector(sel)
-            if el:
-                txt = (await el.inner_text()).strip()
-                if txt:
-                    return txt
-        except Exception:
-            pass
+        node = tree.css_first(sel)
+        if node:
+            txt = node.text(strip=True)
+            if txt:
+                return txt
     return ""
 
-async def _collect_anchor_hrefs_from_page(page) -> List[str]:
-    hrefs = []
+async def _eval_hrefs(page, selector: str) -> List[str]:
+    # CDP 왕복 1번으로 href 전부 가져옴 (element.href는 이미 절대 URL)
     try:
-        els = await page.query_selector_all(LIST_LINK_SELECTOR)
-        for e in els:
-            h = await e.get_attribute("href")
-            if h:
-                hrefs.append(urljoin(BASE, h) if h.startswith("/") or not h.startswith("http") else h)
+        return await page.eval_on_selector_all(selector, HREFS_JS)
     except Exception:
-        pass
+        return []
+
+async def _collect_anchor_hrefs_from_page(page) -> List[str]:
+    hrefs = await _eval_hrefs(page, LIST_LINK_SELECTOR)
     if not hrefs:
         for sel in PRIORITY_SELECTORS:
-            try:
-                els = await page.query_selector_all(sel)
-                for e in els:
-                    h = await e.get_attribute("href")
-                    if h:
-                        hrefs.append(urljoin(BASE, h) if h.startswith("/") or not h.startswith("http") else h)
-            except Exception:
-                continue
-    seen = set(); out = []
-    for h in hrefs:
-        if h not in seen:
-            seen.add(h); out.append(h)
-    return out
+            hrefs.extend(await _eval_hrefs(page, sel))
+    return list(dict.fromkeys(hrefs))
 
 async def _extract_dong_inparams_from_gu(page, gu_name: str) -> List[Tuple[str, str]]:
-    anchors = await page.query_selector_all("a[href*='/kr/buy-sell'], a[href*='?in=']")
+    hrefs = await _eval_hrefs(page, "a[href*='/kr/buy-sell'], a[href*='?in=']")
     seen = {}
-    for a in anchors:
-        href = await a.get_attribute("href")
-        if not href:
-            continue
-        abs_href = urljoin(BASE, href) if href.startswith("/") or not href.startswith("http") else href
+    for abs_href in dict.fromkeys(hrefs):  # 같은 링크를 여러 번 파싱하지 않도록
         parsed = urlparse(abs_href)
         qs = parse_qs(parsed.query)
         in_vals = qs.get("in") or qs.get("in[]") or []
@@ -96,85 +177,128 @@ async def _extract_dong_inparams_from_gu(page, gu_name: str) -> List[Tuple[str,
         if not in_param:
             continue
         dong_name = unquote(in_param.split("-", 1)[0]) if "-" in in_param else unquote(in_param)
-        if dong_name and dong_name not in seen:
-            seen[dong_name] = in_param
-    return [(k, v) for k, v in seen.items()]
+        if dong_name:
+            seen.setdefault(dong_name, in_param)
+    return list(seen.items())
 
-async def _extract_detail(context, url, city, gu, dong, semaphore, results_list):
+async def _extract_detail(client: httpx.AsyncClient, url, category_id: int, city, gu, dong, semaphore, emit):
+    # 상세 페이지는 SSR HTML이라 브라우저 없이 HTTP + selectolax로 읽는다
     async with semaphore:
-        page = await context.new_page()
         try:
-            async def route_handler(route, request):
-                if request.resource_type in ("image", "stylesheet", "font", "media"):
-                    await route.abort()
-                else:
-                    await route.continue_()
-            await page.route("**/*", route_handler)
-
-            await page.goto(url, wait_until="networkidle", timeout=20000)
-            await asyncio.sleep(0.2 + random.random()*0.4)
-
-            title = await _try_selectors_get_text(page, TITLE_SELECTORS)
-            price = await _try_selectors_get_text(page, PRICE_SELECTORS)
-            posted_time = await _try_selectors_get_text(page, TIME_SELECTORS)
-
-            results_list.append({
-                "city": city,
-                "gu": gu,
-                "dong": dong,
-                "title": title or "",
-                "price": price or "",
-                "posted_time": posted_time or "",
-                "url": url
-            })
-        except TimeoutError:
-            pass
-        except PlaywrightTimeoutError:
-            pass
-        finally:
-            await page.close()
-            await asyncio.sleep(0.12 + random.random()*0.4)
+            async with DETAIL_RATE_LIMITER:
+                resp = await client.get(url)
+            resp.raise_for_status()
+        except httpx.HTTPError as e:
+            log.warning("detail fetch failed: %s (%s)", url, e)
+            return
+        tree = HTMLParser(resp.text)
+
+        title = _css_first_text(tree, TITLE_SELECTORS)
+        price = parse_price_to_int(_css_first_text(tree, PRICE_SELECTORS))
+        if price is None:
+            # 나눔/가격 문의 등 숫자 가격이 없는 매물은 시세에 쓸 수 없어 건너뜀
+            return
+
+        # 중간 dict 없이 바로 RawItem으로 만들어 스트림에 넘긴다
+        try:
+            item = RawItem(
+                source=MarketSource.daangn,
+                external_id=_extract_external_id(url),
+                category_id=category_id,
+                title=title or "",
+                price=price,
+                url=url,
+                sd=city,
+                sgg=gu,
+                emd=dong,
+            )
+        except ValidationError as e:
+            log.warning("invalid item skipped: %s (%s)", url, e)
+            return
+        emit(item)
+
+def _collect_article_hrefs_from_json(data) -> List[str]:
+    # 응답 구조가 바뀌어도 견디도록 JSON 전체를 훑어 매물 URL처럼 생긴 문자열만 모은다
+    out: List[str] = []
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, str) and ARTICLE_URL_PAT.match(node):
+            out.append(urljoin(BASE, node))
+    return out
 
-async def _crawl_dong(context, query: str, city: str, gu: str, dong_name: str, in_param: Optional[str],
-                      semaphore, results_list):
+async def _discover_article_hrefs_via_api(client: httpx.AsyncClient, base_region: str, query: str) -> List[str]:
+    """목록 페이지의 JSON 로더(_data)를 직접 호출해 매물 URL을 모은다.
+       스크롤/더보기 없이 페이지당 한 번의 요청. 실패하면 빈 리스트 → 브라우저 경로로 폴백.
+    """
+    collected: List[str] = []
+    seen = set()
+    for pnum in range(1, MAX_PAGES + 1):
+        params = {"search": query, "page": pnum, **LIST_API_PARAMS}
+        try:
+            async with DETAIL_RATE_LIMITER:
+                resp = await client.get(base_region, params=params, headers={"Accept": "application/json"})
+            resp.raise_for_status()
+            data = orjson.loads(resp.content)
+        except (httpx.HTTPError, orjson.JSONDecodeError):
+            break
+        new_found = 0
+        for h in _collect_article_hrefs_from_json(data):
+            if h not in seen:
+                seen.add(h); collected.append(h); new_found += 1
+        if new_found == 0:
+            break
+    return collected
+
+async def _crawl_dong(context, client: httpx.AsyncClient, query: str, city: str, gu: str, dong_name: str, in_param: Optional[str],
+                      semaphore, emit, seen: set):
+    """seen: 스트림 전체에서 공유하는 URL 집합. 겹치는 동/구에서 같은 매물을 두 번 가져오지 않는다."""
+    category_id = CATEGORY_MAP.get(query, get_settings().CATEGORY_IPHONE)
+    if in_param:
+        base_region = f"{BASE}/kr/buy-sell/?in={_qquote(in_param)}"
+    else:
+        city_p = _qquote(city); gu_p = _qquote(gu); dong_p = _qquote(dong_name) if dong_name else ""
+        base_region = f"{BASE}/region/{city_p}/{gu_p}/{dong_p}" if dong_p else f"{BASE}/region/{city_p}/{gu_p}"
+
+    # 1) JSON API로 매물 URL 수집이 되면 브라우저 페이지를 열지 않는다
+    hrefs = await _discover_article_hrefs_via_api(client, base_region, query)
+    if hrefs:
+        fresh = [h for h in hrefs if h not in seen]
+        seen.update(fresh)
+        await asyncio.gather(*(
+            _extract_detail(client, h, category_id, city, gu, dong_name, semaphore, emit) for h in fresh
+        ))
+        return
+
+    # 2) 폴백: 실제 페이지를 띄워 스크롤/더보기로 수집
     page = await context.new_page()
     try:
-        if in_param:
-            base_region = f"{BASE}/kr/buy-sell/?in={quote(in_param)}"
-        else:
-            city_p = quote(city); gu_p = quote(gu); dong_p = quote(dong_name) if dong_name else ""
-            base_region = f"{BASE}/region/{city_p}/{gu_p}/{dong_p}" if dong_p else f"{BASE}/region/{city_p}/{gu_p}"
-
-        start_url = base_region + (("&" if "?" in base_region else "?") + f"search={quote(query)}")
+        start_url = base_region + (("&" if "?" in base_region else "?") + f"search={_qquote(query)}")
         try:
-            await page.goto(start_url, wait_until="networkidle", timeout=20000)
+            await page.goto(start_url, wait_until="domcontentloaded", timeout=10000)
         except PlaywrightTimeoutError:
             await page.close(); return
-
-        async def route_handler(route, request):
-            if request.resource_type in ("image", "stylesheet", "font", "media"):
-                await route.abort()
-            else:
-                await route.continue_()
-        await page.route("**/*", route_handler)
+        await _wait_for(page, ARTICLE_LINK_SELECTOR)
 
         collected = set()
         detail_tasks = []
         no_new_rounds = 0
 
-        MORE_BUTTON_SELECTORS = [
-            "button:has-text('더보기')","button:has-text('더 불러오기')",
-            "a.load-more",".load-more","button.load-more","button#more","a[role='button']"
-        ]
-
         for _ in range(MAX_SCROLL_ROUNDS):
             hrefs_found = await _collect_anchor_hrefs_from_page(page)
             new_found = 0
             for h in hrefs_found:
                 if h not in collected:
                     collected.add(h); new_found += 1
+                    if h in seen:
+                        continue
+                    seen.add(h)
                     detail_tasks.append(asyncio.create_task(
-                        _extract_detail(context, h, city, gu, dong_name, semaphore, results_list)
+                        _extract_detail(client, h, category_id, city, gu, dong_name, semaphore, emit)
                     ))
 
             clicked = False
@@ -213,21 +337,29 @@ async def _crawl_dong(context, query: str, city: str, gu: str, dong_name: str, i
             try:
                 collected2 = set(collected)
                 detail_tasks2 = []
+                t0 = time.monotonic()
                 for pnum in range(1, MAX_PAGES+1):
-                    qparts = [f"search={quote(query)}", f"page={pnum}"]
+                    # 페이지네이션이 안 먹히는 동에서 30페이지를 다 돌지 않도록 시간 예산으로 끊음
+                    if time.monotonic() - t0 > FALLBACK_PAGE_BUDGET_S:
+                        break
+                    qparts = [f"search={_qquote(query)}", f"page={pnum}"]
                     page_url = base_region + ("&" if "?" in base_region else "?") + "&".join(qparts)
                     try:
-                        await page_obj.goto(page_url, wait_until="networkidle", timeout=15000)
+                        await page_obj.goto(page_url, wait_until="domcontentloaded", timeout=10000)
                     except PlaywrightTimeoutError:
                         break
+                    await _wait_for(page_obj, ARTICLE_LINK_SELECTOR)
 
                     hrefs = await _collect_anchor_hrefs_from_page(page_obj)
                     new_found = 0
                     for h in hrefs:
                         if h not in collected2:
                             collected2.add(h); new_found += 1
+                            if h in seen:
+                                continue
+                            seen.add(h)
                             detail_tasks2.append(asyncio.create_task(
-                                _extract_detail(context, h, city, gu, dong_name, semaphore, results_list)
+                                _extract_detail(client, h, category_id, city, gu, dong_name, semaphore, emit)
                             ))
                     if new_found == 0:
                         break
@@ -247,73 +379,138 @@ async def _crawl_dong(context, query: str, city: str, gu: str, dong_name: str, i
 
 
 # ====== Scraper 구현 ======
+_DONE = object()  # 워커 종료 신호 (큐 sentinel)
+
 class DaangnScraper:
     """FastAPI용 크롤러 어댑터: RawItem 스트림을 반환.
        - search(query): 단일 키워드
        - crawl_keywords(keywords): 여러 키워드(아이폰/아이패드/맥북/애플워치/에어팟 등)
+       브라우저/컨텍스트는 스트림당 한 번만 띄우고, 키워드·구 단위 크롤을 동시에 돌린다.
     """
     source = MarketSource.daangn
 
-    async def search(self, query: str, limit: int = 200) -> AsyncIterator[RawItem]:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=HEADLESS)
-            context = await browser.new_context(user_agent=USER_AGENT)
+    def __init__(self) -> None:
+        # 구 → [(동 이름, in 파라미터)] 캐시. 키워드가 바뀌어도 구/동 구성은 같으므로 한 번만 수집
+        self._dong_cache: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+        self._dong_locks: Dict[str, asyncio.Lock] = {}
+
+    async def _get_dongs(self, context, city: str, gu: str, gu_semaphore) -> Optional[List[Tuple[str, Optional[str]]]]:
+        """구 페이지에서 동 목록을 읽는다. 캐시에 있으면 페이지를 열지 않음. 타임아웃이면 None."""
+        if gu in self._dong_cache:
+            return self._dong_cache[gu]
+        lock = self._dong_locks.setdefault(gu, asyncio.Lock())
+        async with lock:
+            # 동시에 들어온 다른 키워드가 먼저 채웠을 수 있음
+            if gu in self._dong_cache:
+                return self._dong_cache[gu]
+            # 열린 구 페이지 수 = GU_CONCURRENCY 이하 (세마포어를 잡은 뒤에 페이지를 연다)
+            async with gu_semaphore:
+                page = await context.new_page()
+                try:
+                    gu_url = f"{BASE}/region/{_qquote(city)}/{_qquote(gu)}"
+                    try:
+                        await page.goto(gu_url, wait_until="domcontentloaded", timeout=10000)
+                    except PlaywrightTimeoutError:
+                        return None
+                    await _wait_for(page, DONG_LINK_SELECTOR)
+
+                    dongs_info = await _extract_dong_inparams_from_gu(page, gu)
+                    if not dongs_info:
+                        dongs_info = [(gu, None)]
+                finally:
+                    await page.close()
+            self._dong_cache[gu] = dongs_info
+            return dongs_info
+
+    async def _crawl_gu(self, context, client: httpx.AsyncClient, query: str, city: str, gu: str, limit: int,
+                        semaphore, gu_semaphore, dong_semaphore, seen: set, out: asyncio.Queue):
+        try:
+            dongs_info = await self._get_dongs(context, city, gu, gu_semaphore)
+            if dongs_info is None:
+                return
 
-            city = "서울특별시"
-            semaphore = asyncio.Semaphore(CONCURRENCY)
+            # 상세가 끝나는 즉시 큐로 흘려보낸다 (url 기준 dedupe, 구 단위 limit)
+            seen_urls = set()
 
-            try:
-                for gu in SEOUL_GU:
-                    page = await context.new_page()
-                    try:
-                        gu_url = f"{BASE}/region/{quote(city)}/{quote(gu)}"
-                        try:
-                            await page.goto(gu_url, wait_until="networkidle", timeout=20000)
-                        except PlaywrightTimeoutError:
-                            await page.close(); continue
-
-                        dongs_info = await _extract_dong_inparams_from_gu(page, gu)
-                        if not dongs_info:
-                            dongs_info = [(gu, None)]
-                        await page.close()
-
-                        results: List[dict] = []
-                        for dong_name, in_param in dongs_info:
-                            await _crawl_dong(context, query, city, gu, dong_name, in_param, semaphore, results)
-                            if len(results) >= limit:
-                                break
-
-                        # dedupe by url & limit
-                        seen_urls = set()
-                        for r in results:
-                            if r["url"] in seen_urls:
-                                continue
-                            seen_urls.add(r["url"])
-                            yield RawItem(
-                                source=self.source,
-                                external_id=_extract_external_id(r["url"]),
-                                title=r.get("title") or "",
-                                price_text=r.get("price"),
-                                price=None,
-                                url=r["url"],
-                                city=r.get("city"),
-                                gu=r.get("gu"),
-                                dong=r.get("dong"),
-                            )
-                            if len(seen_urls) >= limit:
-                                break
-
-                    except Exception:
-                        try:
-                            await page.close()
-                        except:
-                            pass
+            def emit(item: RawItem):
+                url = str(item.url)
+                if len(seen_urls) >= limit or url in seen_urls:
+                    return
+                seen_urls.add(url)
+                out.put_nowait(item)
+
+            # 동 단위도 순차가 아니라 공유 세마포어 안에서 동시에 수집
+            async def one_dong(dong_name: str, in_param: Optional[str]):
+                async with dong_semaphore:
+                    if len(seen_urls) >= limit:
+                        return
+                    await _crawl_dong(context, client, query, city, gu, dong_name, in_param, semaphore, emit, seen)
+
+            await asyncio.gather(*(one_dong(d, i) for d, i in dongs_info))
+
+        except Exception:
+            # 한 구의 실패가 다른 구 크롤을 멈추지 않도록 계속 진행하되, 원인은 남긴다
+            log.exception("[%s] crawl failed for %s", query, gu)
+
+    async def _run(self, context, client: httpx.AsyncClient, query: str, limit: int,
+                   semaphore, gu_semaphore, dong_semaphore, seen: set, out: asyncio.Queue):
+        city = "서울특별시"
+        await asyncio.gather(*(
+            self._crawl_gu(context, client, query, city, gu, limit, semaphore, gu_semaphore, dong_semaphore, seen, out)
+            for gu in SEOUL_GU
+        ))
+
+    async def _stream(self, queries: Sequence[str], limit: int) -> AsyncIterator[RawItem]:
+        out: asyncio.Queue = asyncio.Queue()
+        async with _profile_dir(get_settings().PW_CACHE_ROOT) as user_data_dir, async_playwright() as p:
+            # 영구 컨텍스트: 실행 간 HTTP/JS 캐시를 디스크에 유지해 구 페이지 재방문이 빨라짐
+            context = await p.chromium.launch_persistent_context(
+                user_data_dir, headless=HEADLESS, user_agent=USER_AGENT,
+                args=CHROMIUM_ARGS, viewport=VIEWPORT,
+            )
+            await context.route("**/*", _block_route)
+
+            client = httpx.AsyncClient(
+                headers={"User-Agent": USER_AGENT},
+                timeout=10.0,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=DETAIL_CONCURRENCY),
+            )
+            semaphore = asyncio.Semaphore(DETAIL_CONCURRENCY)  # 상세 페이지 동시 수
+            gu_semaphore = asyncio.Semaphore(GU_CONCURRENCY)  # 구 목록 페이지 동시 수
+            dong_semaphore = asyncio.Semaphore(DONG_CONCURRENCY)  # 동 목록 수집 동시 수
+            seen: set = set()  # 스트림 전체에서 상세를 가져간 URL
+
+            async def worker():
+                try:
+                    await asyncio.gather(*(
+                        self._run(context, client, q, limit, semaphore, gu_semaphore, dong_semaphore, seen, out) for q in queries
+                    ))
+                finally:
+                    out.put_nowait(_DONE)
 
+            task = asyncio.create_task(worker())
+            try:
+                while True:
+                    item = await out.get()
+                    if item is _DONE:
+                        break
+                    yield item
+                await task
             finally:
+                if not task.done():
+                    task.cancel()
+                    try:
+                        await task
+                    except BaseException:
+                        pass
+                await client.aclose()
                 await context.close()
-                await browser.close()
+
+    async def search(self, query: str, limit: int = 200) -> AsyncIterator[RawItem]:
+        async for item in self._stream([query], limit):
+            yield item
 
     async def crawl_keywords(self, keywords: Sequence[str] = DEFAULT_KEYWORDS, limit_per_keyword: int = 200) -> AsyncIterator[RawItem]:
-        for kw in keywords:
-            async for item in self.search(kw, limit=limit_per_keyword):
-                yield item
+        async for item in self._stream(keywords, limit_per_keyword):
+            yield item
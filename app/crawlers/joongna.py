@@ -10,16 +10,23 @@
 
 import re
 import os
-import json
+import csv
 import time
 import random
+import threading
+import atexit
 import argparse
-from typing import Optional, List, Dict, Tuple
-from urllib.parse import quote, urljoin
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Tuple, Union
+from urllib.parse import quote, urljoin, urlsplit, urlunsplit
 
+import orjson
 import requests
-import pandas as pd
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve as sv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Selenium imports
 from selenium import webdriver
@@ -55,13 +62,90 @@ API_HEADERS = {
     "Referer": "https://web.joongna.com/",
 }
 
-PRICE_PAT = re.compile(r"(\d{1,3}(?:,\d{3})*|\d+)\s*원")
+
+def _make_session(headers: dict) -> requests.Session:
+    """
+    커넥션 풀을 유지하는 Session 생성
+    - 요청마다 TCP/TLS 핸드셰이크를 다시 하지 않도록 keep-alive 재사용
+    - 502/503/504는 짧게 재시도
+    """
+    session = requests.Session()
+    session.headers.update(headers)
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=32,
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# web.joongna.com (HTML) / api.joongna.com (JSON) 용 세션을 따로 둔다
+SESSION = _make_session(HEADERS)
+API_SESSION = _make_session(API_HEADERS)
+
+# 결과 row/CSV 컬럼 (API/HTML 버전 공통)
+CSV_COLS = ["name", "price", "location", "time", "link"]
+
+# HTML 본문 읽기 상한 (넘으면 잘라서 파싱) - 비정상적으로 큰 페이지 대비
+DETAIL_MAX_BYTES = 512_000  # 상세: JSON-LD/상품 정보가 앞쪽에 있음
+SEARCH_MAX_BYTES = 2_000_000  # 검색: 상품 그리드가 문서 뒤쪽까지 이어질 수 있어 넉넉히
+
+
+def _get_html_bytes(url: str, max_bytes: int) -> bytes:
+    """본문을 스트리밍으로 읽다가 max_bytes를 넘거나 </html>을 만나면 중단."""
+    with SESSION.get(url, timeout=20, stream=True) as resp:
+        resp.raise_for_status()
+        chunks: List[bytes] = []
+        total = 0
+        for chunk in resp.iter_content(chunk_size=65536):
+            chunks.append(chunk)
+            total += len(chunk)
+            if total >= max_bytes or b"</html>" in chunk:
+                break
+    return b"".join(chunks)
+
+# google-re2가 설치돼 있으면 DFA 엔진으로 매칭 (카드/span마다 수천 번 호출됨)
+# 두 패턴 모두 역참조가 없어서 re2에서 그대로 컴파일된다
+try:
+    import re2 as _fast_re
+except ImportError:
+    _fast_re = re
+
+PRICE_PAT = _fast_re.compile(r"(\d{1,3}(?:,\d{3})*|\d+)\s*원")
 # 숫자(영문/전각 모두) + 단위 + "전"
-TIME_PAT = re.compile(r"[0-9０-９]+\s*(초|분|시간|일|주|개월|달)\s*전")
+TIME_PAT = _fast_re.compile(r"[0-9０-９]+\s*(초|분|시간|일|주|개월|달)\s*전")
+TIME_WINDOW = 10  # "전" 앞으로 이만큼만 정규식에 넘김 ('12개월 전' 등 충분)
+
+
+def search_time(text: str) -> Optional[str]:
+    """
+    text에서 첫 번째 '32분 전' 형태 문자열을 찾아 반환.
+    - "전"의 위치를 str.find로 먼저 찾고 그 앞 TIME_WINDOW 글자만 정규식으로 확인
+    - 긴 본문 텍스트에서도 정규식이 전체를 훑지 않음
+    """
+    i = text.find("전")
+    while i >= 0:
+        m = TIME_PAT.search(text[max(0, i - TIME_WINDOW):i + 1])
+        if m:
+            return m.group(0)
+        i = text.find("전", i + 1)
+    return None
 
 
 # ================== Selenium WebDriver 설정 ==================
 
+BLOCKED_URL_PATTERNS = [
+    "*google-analytics*",
+    "*googletagmanager*",
+    "*doubleclick*",
+    "*hotjar*",
+    "*facebook*",
+]
+# 리스트가 뜬 뒤 렌더링 마무리를 기다리는 최대 시간 (초)
+RENDER_SETTLE_TIMEOUT = 1.0
+
 
 def create_driver(headless: bool = True) -> webdriver.Chrome:
     """
@@ -78,28 +162,75 @@ def create_driver(headless: bool = True) -> webdriver.Chrome:
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument(f"user-agent={USER_AGENT}")
     chrome_options.add_argument("--window-size=1920,1080")
-
-    # 이미지 로딩 비활성화로 속도 향상
-    prefs = {"profile.managed_default_content_settings.images": 2}
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-features=TranslateUI")
+
+    # DOMContentLoaded에서 driver.get 반환 (광고/트래킹 로딩까지 기다리지 않음)
+    # 상품 리스트는 이후 WebDriverWait로 보장
+    chrome_options.page_load_strategy = "eager"
+
+    # 이미지/CSS/폰트/플러그인 로딩 비활성화로 속도 향상
+    prefs = {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.stylesheets": 2,
+        "profile.managed_default_content_settings.fonts": 2,
+        "profile.managed_default_content_settings.plugins": 2,
+    }
     chrome_options.add_experimental_option("prefs", prefs)
 
+    # implicitly_wait은 명시적 WebDriverWait와 겹쳐 대기가 두 번 걸리므로 쓰지 않음
     driver = webdriver.Chrome(options=chrome_options)
-    driver.implicitly_wait(10)
+
+    # 분석/광고 스크립트는 크롤링에 필요 없으니 네트워크 단에서 차단
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
 
     return driver
 
 
+_DRIVER: Optional[webdriver.Chrome] = None
+
+
+def get_driver(headless: bool = True) -> webdriver.Chrome:
+    """
+    프로세스 내에서 WebDriver 하나를 재사용 (Chrome 콜드 스타트 1~2초 절약)
+    - 처음 호출할 때만 생성, 이후 headless 값은 무시됨
+    """
+    global _DRIVER
+    if _DRIVER is None:
+        _DRIVER = create_driver(headless=headless)
+    return _DRIVER
+
+
+def close_driver() -> None:
+    global _DRIVER
+    if _DRIVER is not None:
+        _DRIVER.quit()
+        _DRIVER = None
+        print("\n🔒 WebDriver 종료")
+
+
+atexit.register(close_driver)
+
+
 # ================== JSON-LD / 가격 파서 ==================
 
 
-def _parse_jsonld_product(soup: BeautifulSoup) -> dict:
+# 원본 bytes에서 JSON-LD 블록만 바로 잘라냄 (soup 트리를 다시 훑지 않음)
+JSONLD_PAT = re.compile(
+    rb"<script[^>]*type=[\"']application/ld\+json[\"'][^>]*>(.*?)</script>",
+    re.S | re.I,
+)
+
+
+def _parse_jsonld_product(html: bytes) -> dict:
     """JSON-LD(Product)의 name/price/seller/date* 등을 추출."""
     out = {"name": None, "price": None, "seller": None, "date": None}
-    for tag in soup.find_all("script", type="application/ld+json"):
-        raw = tag.string or ""
+    for raw in JSONLD_PAT.findall(html):
         try:
-            data = json.loads(raw)
-        except Exception:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
             continue
 
         items = data if isinstance(data, list) else [data]
@@ -136,8 +267,12 @@ def _parse_jsonld_product(soup: BeautifulSoup) -> dict:
     return out
 
 
-def _extract_price_from_text(soup: BeautifulSoup) -> Optional[int]:
+def _extract_price_from_text(soup: BeautifulSoup, full_text: str) -> Optional[int]:
     """여러 후보 노드와 전체 텍스트에서 가격 정규식으로 백업 추출."""
+    # 페이지 어디에도 "원"이 없으면 셀렉터(트리 전체 탐색)까지 갈 필요 없음
+    if "원" not in full_text:
+        return None
+
     candidates: List[str] = []
     candidates += [
         el.get_text(" ", strip=True)
@@ -145,7 +280,7 @@ def _extract_price_from_text(soup: BeautifulSoup) -> Optional[int]:
             "div[class*='price'], span[class*='price'], div.font-semibold"
         )
     ]
-    candidates.append(soup.get_text(" ", strip=True)[:8000])
+    candidates.append(full_text[:8000])
 
     for txt in candidates:
         txt = (txt or "").replace("\u00a0", " ")
@@ -161,37 +296,38 @@ def _extract_price_from_text(soup: BeautifulSoup) -> Optional[int]:
 # ================== 시간/위치 판별 유틸 ==================
 
 
-def looks_like_time(text: str) -> bool:
-    """'32분 전' 같은 시간 문자열인지 대충 판단."""
-    text = text.replace("\u00a0", " ").strip()
-    if "전" not in text:
-        return False
-    if not TIME_PAT.search(text):
-        return False
-    return True
+SPAN_OTHER, SPAN_TIME, SPAN_LOC = 0, 1, 2
+# 지명 접미사는 모두 한 글자라 문자 집합 하나로 한 번에 검사
+_LOC_CHARS = frozenset("동구시읍면리")
 
 
-def looks_like_location(text: str) -> bool:
-    """'인계동', '논현1동' 같은 위치 문자열인지 대충 판단."""
+def classify_span(text: str) -> int:
+    """
+    span 텍스트 하나를 한 번만 훑어서 시간/위치/기타로 분류.
+    - 시간('32분 전')이 위치보다 우선
+    - 위치는 '인계동', '논현1동'처럼 짧고 지명 접미사가 붙은 문자열
+    """
     text = text.replace("\u00a0", " ").strip()
-
     if not text:
-        return False
-    if "|" in text:
-        return False
-    if "원" in text:
-        return False
-    if looks_like_time(text):
-        return False
-    # 너무 길면 제목일 확률 높음
-    if len(text) > 15:
-        return False
+        return SPAN_OTHER
+    if search_time(text):
+        return SPAN_TIME
+    # 구분자/가격이 섞였거나 너무 길면(제목일 확률 높음) 위치 아님
+    if "|" in text or "원" in text or len(text) > 15:
+        return SPAN_OTHER
+    if not _LOC_CHARS.isdisjoint(text):
+        return SPAN_LOC
+    return SPAN_OTHER
 
-    # 동/구/시/읍/면/리 같은 지명 접미사 포함하면 위치일 확률 높음
-    if any(suffix in text for suffix in ["동", "구", "시", "읍", "면", "리"]):
-        return True
 
-    return False
+def looks_like_time(text: str) -> bool:
+    """'32분 전' 같은 시간 문자열인지 대충 판단."""
+    return classify_span(text) == SPAN_TIME
+
+
+def looks_like_location(text: str) -> bool:
+    """'인계동', '논현1동' 같은 위치 문자열인지 대충 판단."""
+    return classify_span(text) == SPAN_LOC
 
 
 # ================== 상세 페이지 파서 (이름/가격만) ==================
@@ -200,18 +336,19 @@ def looks_like_location(text: str) -> bool:
 def parse_product_page(url: str, save_html: bool = False) -> Optional[dict]:
     """상품 상세페이지에서 name/price/time/location 추출"""
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=20)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
+        html = _get_html_bytes(url, DETAIL_MAX_BYTES)
+        soup = BeautifulSoup(html, "lxml")  # bytes 그대로 넘겨 이중 디코딩 방지
+        # 전체 텍스트는 트리를 통째로 훑으므로 한 번만 만들어 가격/시간 추출에 같이 씀
+        full_text = soup.get_text(" ", strip=True)
 
         # 디버그: 첫 상세 페이지 HTML 저장
         if save_html:
-            with open("first_product_detail.html", "w", encoding="utf-8") as f:
-                f.write(resp.text)
+            with open("first_product_detail.html", "wb") as f:
+                f.write(html)
             print(f"  💾 상세 페이지 HTML 저장됨: first_product_detail.html")
 
         # JSON-LD(Product) 우선
-        jl = _parse_jsonld_product(soup)
+        jl = _parse_jsonld_product(html)
         name = jl.get("name")
         price = jl.get("price")
 
@@ -220,7 +357,7 @@ def parse_product_page(url: str, save_html: bool = False) -> Optional[dict]:
             h1 = soup.select_one("h1")
             name = h1.get_text(strip=True) if h1 else "상품명없음"
         if price is None:
-            p2 = _extract_price_from_text(soup)
+            p2 = _extract_price_from_text(soup, full_text)
             price = int(p2) if p2 is not None else 0
 
         # 시간과 위치 정보 추출 시도
@@ -228,10 +365,7 @@ def parse_product_page(url: str, save_html: bool = False) -> Optional[dict]:
         location = "지역없음"
 
         # 전체 텍스트에서 시간 정보 찾기
-        full_text = soup.get_text(" ", strip=True)
-        time_match = TIME_PAT.search(full_text)
-        if time_match:
-            time_val = time_match.group(0)
+        time_val = search_time(full_text) or time_val
 
         # span.text-gray-400 같은 요소들에서 위치/시간 찾기
         gray_spans = soup.select("span.text-gray-400, span.text-sm")
@@ -240,9 +374,10 @@ def parse_product_page(url: str, save_html: bool = False) -> Optional[dict]:
             if not txt or txt == "|":
                 continue
 
-            if looks_like_time(txt):
+            kind = classify_span(txt)
+            if kind == SPAN_TIME:
                 time_val = txt
-            elif looks_like_location(txt) and location == "지역없음":
+            elif kind == SPAN_LOC and location == "지역없음":
                 location = txt
 
         # 디버그 출력
@@ -269,6 +404,8 @@ def parse_product_page(url: str, save_html: bool = False) -> Optional[dict]:
 
 # ================== API 기반 검색 ==================
 
+# API 아이템에서 시간으로 쓸 수 있는 필드 (앞에 있을수록 우선)
+_TIME_FIELDS = ("timeAgo", "time", "createdAt", "updatedAt", "publishedAt")
 
 def fetch_search_api(keyword: str, page: int = 0) -> Optional[dict]:
     """
@@ -284,10 +421,9 @@ def fetch_search_api(keyword: str, page: int = 0) -> Optional[dict]:
 
     print(f"🌐 API 검색 요청: {API_SEARCH_URL} (page={page})")
     try:
-        resp = requests.get(API_SEARCH_URL, headers=API_HEADERS, params=params, timeout=20)
+        resp = API_SESSION.get(API_SEARCH_URL, params=params, timeout=20)
         resp.raise_for_status()
-        data = resp.json()
-        return data
+        return orjson.loads(resp.content)
     except Exception as e:
         print(f"❌ API 요청 실패 (page={page}): {e}")
         return None
@@ -299,11 +435,11 @@ def extract_products_from_api(data: dict, debug: bool = False) -> List[Dict[str,
     """
     products: List[Dict[str, str]] = []
 
-    if not data or "data" not in data:
+    try:
+        items = data["data"]["items"] or []
+    except (KeyError, TypeError):
         return products
 
-    items = data.get("data", {}).get("items", [])
-
     for idx, item in enumerate(items):
         product_id = item.get("productSeq") or item.get("seq") or item.get("id")
         if not product_id:
@@ -313,13 +449,8 @@ def extract_products_from_api(data: dict, debug: bool = False) -> List[Dict[str,
         price = item.get("price", 0)
         location = item.get("town") or item.get("location") or "지역없음"
 
-        # 시간 정보 추출
-        time_val = "시간없음"
-        # createdAt, updatedAt, publishedAt 등의 필드가 있을 수 있음
-        for time_field in ["timeAgo", "time", "createdAt", "updatedAt", "publishedAt"]:
-            if item.get(time_field):
-                time_val = str(item[time_field])
-                break
+        # 시간 정보 추출 (timeAgo, createdAt 등 먼저 있는 필드)
+        time_val = next((str(item[f]) for f in _TIME_FIELDS if item.get(f)), "시간없음")
 
         link = f"https://web.joongna.com/product/{product_id}"
 
@@ -368,8 +499,15 @@ def fetch_search_page_selenium(driver: webdriver.Chrome, keyword: str, page: int
         wait = WebDriverWait(driver, 10)
         wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "ul.grid li")))
 
-        # JavaScript 실행 완료를 위해 추가 대기
-        time.sleep(2)
+        # JavaScript 실행 완료 대기 (고정 2초 대신 완료되는 즉시 진행, 최대 1초)
+        try:
+            WebDriverWait(driver, RENDER_SETTLE_TIMEOUT, poll_frequency=0.1).until(
+                lambda d: d.execute_script(
+                    "return document.readyState === 'complete' && !!document.querySelector('ul.grid li')"
+                )
+            )
+        except TimeoutException:
+            pass
 
         html = driver.page_source
 
@@ -392,7 +530,7 @@ def fetch_search_page_selenium(driver: webdriver.Chrome, keyword: str, page: int
 # ================== 검색 페이지 HTML 파서 (requests 버전) ==================
 
 
-def fetch_search_page_html(keyword: str, page: int = 1, save_html: bool = False) -> Optional[str]:
+def fetch_search_page_html(keyword: str, page: int = 1, save_html: bool = False) -> Optional[bytes]:
     """
     검색 결과 페이지 HTML 요청
     - 1페이지: /search/키워드?keywordSource=INPUT_KEYWORD
@@ -407,21 +545,26 @@ def fetch_search_page_html(keyword: str, page: int = 1, save_html: bool = False)
 
     print(f"🌐 검색 페이지 요청: {url}")
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=20)
-        resp.raise_for_status()
+        html = _get_html_bytes(url, SEARCH_MAX_BYTES)
 
         # 디버그: HTML 저장
         if save_html and page == 1:
-            with open(f"{keyword}_search_page.html", "w", encoding="utf-8") as f:
-                f.write(resp.text)
+            with open(f"{keyword}_search_page.html", "wb") as f:
+                f.write(html)
             print(f"  💾 HTML 저장됨: {keyword}_search_page.html")
 
-        return resp.text
+        return html
     except Exception as e:
         print(f"❌ 검색 페이지 요청 실패 (page={page}): {e}")
         return None
 
 
+# 카드 안 위치/시간 후보 span 셀렉터 (모듈 로드 시 한 번만 컴파일)
+_LI_INFO_SPANS = sv.compile(
+    "div.mt-1.mb-2 span, div[class*='mt-1'][class*='mb-2'] span, span.text-gray-400"
+)
+
+
 def _extract_location_time_from_li(li: BeautifulSoup) -> Tuple[str, str]:
     """
     li 카드 하나에서 위치 / 시간 텍스트 추출.
@@ -430,67 +573,51 @@ def _extract_location_time_from_li(li: BeautifulSoup) -> Tuple[str, str]:
     location = "지역없음"
     time_val = "시간없음"
 
-    # 방법 1: 특정 div(mt-1 mb-2) 안의 span들 찾기
+    # 방법 1: 정보 div(mt-1 mb-2) 안의 span + text-gray-400 span을 한 번에 훑기
     # <div class="mt-1 mb-2 min-h-6 max-lg:mb-0 max-lg:mt-1.5">
-    info_div = li.select_one("div.mt-1.mb-2, div[class*='mt-1'][class*='mb-2']")
-    if info_div:
-        spans = info_div.find_all("span")
-        for s in spans:
-            txt = s.get_text(strip=True)
-            if not txt or txt == "|":
-                continue
-
-            # 시간 패턴 체크 (우선순위)
-            if looks_like_time(txt):
-                time_val = txt
-            # 위치 패턴 체크
-            elif looks_like_location(txt) and location == "지역없음":
-                location = txt
-
-    # 방법 2: 모든 span에서 text-gray-400 클래스를 가진 것들 찾기
-    if location == "지역없음" or time_val == "시간없음":
-        gray_spans = li.select("span.text-gray-400")
-        for s in gray_spans:
-            txt = s.get_text(strip=True)
-            if not txt or txt == "|":
-                continue
+    for s in _LI_INFO_SPANS.select(li):
+        txt = s.get_text(strip=True)
+        if not txt or txt == "|":
+            continue
 
-            if time_val == "시간없음" and looks_like_time(txt):
-                time_val = txt
-            elif location == "지역없음" and looks_like_location(txt):
-                location = txt
+        # 시간은 마지막에 나온 것, 위치는 처음 나온 것
+        kind = classify_span(txt)
+        if kind == SPAN_TIME:
+            time_val = txt
+        elif kind == SPAN_LOC and location == "지역없음":
+            location = txt
 
-    # 방법 3: 모든 span 검색
+    # 방법 2: 모든 span 검색
     if location == "지역없음" or time_val == "시간없음":
-        span_texts: List[str] = []
+        need_time = time_val == "시간없음"
+        need_loc = location == "지역없음"
         for s in li.find_all("span"):
             txt = s.get_text(strip=True)
             if not txt or txt == "|":
                 continue
-            span_texts.append(txt)
 
-        if time_val == "시간없음":
-            time_candidates = [t for t in span_texts if looks_like_time(t)]
-            if time_candidates:
+            kind = classify_span(txt)
+            if need_time and kind == SPAN_TIME:
                 # 여러 개면 제일 마지막을 시간으로
-                time_val = time_candidates[-1]
-
-        if location == "지역없음":
-            loc_candidates = [t for t in span_texts if looks_like_location(t)]
-            if loc_candidates:
-                location = loc_candidates[0]
+                time_val = txt
+            elif need_loc and kind == SPAN_LOC:
+                # 위치는 처음 나온 것
+                location = txt
+                need_loc = False
 
-    # 방법 4: 그래도 시간 못 찾았으면 li 전체 텍스트에서 정규식으로 탐색
+    # 방법 3: 그래도 시간 못 찾았으면 li 전체 텍스트에서 정규식으로 탐색
     if time_val == "시간없음":
         full_txt = li.get_text(" ", strip=True)
-        match = TIME_PAT.search(full_txt)
-        if match:
-            time_val = match.group(0)
+        time_val = search_time(full_txt) or time_val
 
     return location, time_val
 
 
-def extract_products_from_search(html: str, debug: bool = False) -> List[Dict[str, str]]:
+# 검색 결과에서는 상품 그리드(ul.grid)만 파싱 (헤더/푸터/스크립트는 토큰화 단계에서 버림)
+_LIST_STRAINER = SoupStrainer("ul", class_="grid")
+
+
+def extract_products_from_search(html: Union[str, bytes], debug: bool = False) -> List[Dict[str, str]]:
     """
     검색 결과 HTML에서 상품 카드(li)별로
     - link
@@ -498,7 +625,7 @@ def extract_products_from_search(html: str, debug: bool = False) -> List[Dict[st
     - time
     을 추출.
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "lxml", parse_only=_LIST_STRAINER)
     products: List[Dict[str, str]] = []
     seen: set[str] = set()
 
@@ -566,6 +693,90 @@ def extract_products_from_search(html: str, debug: bool = False) -> List[Dict[st
     return products
 
 
+# ================== 상세 페이지 병렬 수집 ==================
+
+DETAIL_WORKERS = 8  # 상세 페이지 동시 요청 수 (SESSION 풀 크기 이하)
+DETAIL_JITTER = (0.1, 0.3)  # 워커별 요청 전 짧은 지연 (서버 예의)
+
+
+def _norm_product_url(url: str) -> str:
+    """쿼리/프래그먼트를 떼서 같은 상품이면 같은 키가 되도록"""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+
+DETAIL_CACHE_SIZE = 4096
+_detail_cache: Dict[str, dict] = {}
+_detail_cache_lock = threading.Lock()  # 스레드 풀에서 동시에 채우므로 삭제/삽입을 묶음
+
+
+def _cached_parse(url: str) -> Optional[dict]:
+    # 페이지가 넘어가며 같은 상품이 다시 나와도 상세 페이지는 한 번만 요청
+    # 실패(None)는 일시적일 수 있으니 캐시하지 않고 다음에 다시 시도
+    detail = _detail_cache.get(url)
+    if detail is not None:
+        return detail
+    time.sleep(random.uniform(*DETAIL_JITTER))
+    detail = parse_product_page(url)
+    if detail is not None:
+        with _detail_cache_lock:
+            if len(_detail_cache) >= DETAIL_CACHE_SIZE:
+                # 가장 먼저 들어온 항목부터 버림 (dict 삽입 순서)
+                _detail_cache.pop(next(iter(_detail_cache)), None)
+            _detail_cache[url] = detail
+    return detail
+
+
+def _fetch_card_detail(card: Dict[str, str], save_html: bool) -> Tuple[Dict[str, str], Optional[dict]]:
+    if save_html:
+        # HTML 저장은 부수효과가 있으니 캐시를 거치지 않음
+        time.sleep(random.uniform(*DETAIL_JITTER))
+        return card, parse_product_page(card["link"], save_html=True)
+    return card, _cached_parse(_norm_product_url(card["link"]))
+
+
+def _collect_details(executor: ThreadPoolExecutor, product_cards: List[Dict[str, str]], results: List[dict], limit: int, save_html: bool = False) -> None:
+    """
+    검색 카드들의 상세 페이지를 스레드 풀로 동시에 가져와 results에 추가
+    - limit까지 남은 개수만큼만 요청
+    - 결과 순서는 검색 카드 순서를 유지 (executor.map)
+    """
+    cards = product_cards[: max(limit - len(results), 0)]
+    # 첫 상품만 HTML 저장
+    save_first = len(results) == 0 and save_html
+
+    for card, detail in executor.map(
+        lambda ic: _fetch_card_detail(ic[1], save_html=(save_first and ic[0] == 0)),
+        enumerate(cards),
+    ):
+        if not detail:
+            continue
+
+        # 상세 페이지에서 가져온 정보 우선 사용, 없으면 검색 페이지 정보 사용
+        location = detail.get("location", "지역없음")
+        if location == "지역없음":
+            location = card["location"]
+
+        time_val = detail.get("time", "시간없음")
+        if time_val == "시간없음":
+            time_val = card["time"]
+
+        row = {
+            "name": detail["name"],
+            "price": detail["price"],
+            "location": location,
+            "time": time_val,
+            "link": card["link"],
+        }
+
+        print(
+            f"✅ {row['name']} / {row['price']}원 / "
+            f"{row['location']} / {row['time']}"
+        )
+
+        results.append(row)
+
+
 # ================== 오케스트레이션(API 버전) ==================
 
 
@@ -605,10 +816,11 @@ def crawl_search_api(keyword: str, limit: int = 200, sleep_range=(1.0, 3.0), deb
             )
 
             results.append(product)
-            time.sleep(random.uniform(*sleep_range))
 
         page += 1
-        time.sleep(random.uniform(*sleep_range))
+        # 상품마다가 아니라 다음 API 페이지를 요청할 때만 쉼
+        if len(results) < limit:
+            time.sleep(random.uniform(*sleep_range))
 
     return results
 
@@ -616,29 +828,30 @@ def crawl_search_api(keyword: str, limit: int = 200, sleep_range=(1.0, 3.0), deb
 # ================== 오케스트레이션(Selenium 버전) ==================
 
 
-def crawl_search_selenium(keyword: str, limit: int = 200, sleep_range=(1.0, 3.0), debug: bool = False, headless: bool = True) -> List[dict]:
+def crawl_search_selenium(keyword: str, limit: int = 200, sleep_range=(1.0, 3.0), debug: bool = False, headless: bool = True, save_html: bool = False) -> List[dict]:
     """
     Selenium을 사용한 상품 크롤링
     - keyword: 검색할 키워드 (예: "아이폰")
     - limit: 수집할 상품 개수
     - debug: 디버그 모드
     - headless: True면 브라우저 창을 띄우지 않음
+    - save_html: 첫 검색/상세 페이지 HTML 저장 (디버그용)
     """
     results: List[dict] = []
     page = 1
 
     print(f"🔍 '{keyword}' 검색 결과 크롤링 시작 (Selenium 버전)...\n")
 
-    # WebDriver 생성
-    driver = create_driver(headless=headless)
+    # WebDriver (키워드가 바뀌어도 같은 프로세스면 재사용)
+    driver = get_driver(headless=headless)
+    executor = ThreadPoolExecutor(max_workers=DETAIL_WORKERS)
 
     try:
         while len(results) < limit:
             print(f"📄 검색 결과 페이지 {page} 요청 중...")
 
             # 첫 페이지만 HTML 저장
-            save_html = (page == 1 and globals().get('SAVE_HTML', False))
-            html = fetch_search_page_selenium(driver, keyword, page=page, save_html=save_html)
+            html = fetch_search_page_selenium(driver, keyword, page=page, save_html=(save_html and page == 1))
             if not html:
                 print("⚠️ 검색 페이지 응답이 비어있습니다. 크롤링 종료.")
                 break
@@ -649,53 +862,13 @@ def crawl_search_selenium(keyword: str, limit: int = 200, sleep_range=(1.0, 3.0)
                 print("⚠️ 더 이상 상품 카드가 없습니다. 크롤링 종료.")
                 break
 
-            for card in product_cards:
-                if len(results) >= limit:
-                    break
-
-                link = card["link"]
-                location_from_search = card["location"]
-                time_from_search = card["time"]
-
-                # 첫 상품만 HTML 저장
-                save_detail_html = (len(results) == 0 and globals().get('SAVE_HTML', False))
-                detail = parse_product_page(link, save_html=save_detail_html)
-                if not detail:
-                    continue
-
-                # 상세 페이지에서 가져온 정보 우선 사용, 없으면 검색 페이지 정보 사용
-                location = detail.get("location", "지역없음")
-                if location == "지역없음":
-                    location = location_from_search
-
-                time_val = detail.get("time", "시간없음")
-                if time_val == "시간없음":
-                    time_val = time_from_search
-
-                row = {
-                    "name": detail["name"],
-                    "price": detail["price"],
-                    "location": location,
-                    "time": time_val,
-                    "link": link,
-                }
-
-                print(
-                    f"✅ {row['name']} / {row['price']}원 / "
-                    f"{row['location']} / {row['time']}"
-                )
-
-                results.append(row)
-
-                time.sleep(random.uniform(*sleep_range))  # 상세 페이지 크롤링 간 딜레이
+            _collect_details(executor, product_cards, results, limit, save_html=save_html)
 
             page += 1
             time.sleep(random.uniform(*sleep_range))  # 페이지 전환 딜레이
 
     finally:
-        # WebDriver 종료
-        driver.quit()
-        print("\n🔒 WebDriver 종료")
+        executor.shutdown(wait=True)
 
     return results
 
@@ -703,76 +876,44 @@ def crawl_search_selenium(keyword: str, limit: int = 200, sleep_range=(1.0, 3.0)
 # ================== 오케스트레이션(HTML 버전 - requests) ==================
 
 
-def crawl_search_results(keyword: str, limit: int = 200, sleep_range=(1.0, 3.0), debug: bool = False) -> List[dict]:
+def crawl_search_results(keyword: str, limit: int = 200, sleep_range=(1.0, 3.0), debug: bool = False, save_html: bool = False) -> List[dict]:
     """
     검색 키워드 기반 상품 크롤링 (HTML 버전)
     - keyword: 검색할 키워드 (예: "아이폰")
     - limit: 수집할 상품 개수
     - debug: 디버그 모드 활성화 (처음 몇 개 상품의 상세 정보 출력)
+    - save_html: 첫 검색/상세 페이지 HTML 저장 (디버그용)
     """
     results: List[dict] = []
     page = 1
 
     print(f"🔍 '{keyword}' 검색 결과 크롤링 시작...\n")
 
-    while len(results) < limit:
-        print(f"📄 검색 결과 페이지 {page} 요청 중...")
+    executor = ThreadPoolExecutor(max_workers=DETAIL_WORKERS)
 
-        # 첫 페이지만 HTML 저장
-        save_html = (page == 1 and globals().get('SAVE_HTML', False))
-        html = fetch_search_page_html(keyword, page=page, save_html=save_html)
-        if not html:
-            print("⚠️ 검색 페이지 응답이 비어있습니다. 크롤링 종료.")
-            break
-
-        # 첫 페이지만 디버그 출력
-        product_cards = extract_products_from_search(html, debug=(debug and page == 1))
-        if not product_cards:
-            print("⚠️ 더 이상 상품 카드가 없습니다. 크롤링 종료.")
-            break
+    try:
+        while len(results) < limit:
+            print(f"📄 검색 결과 페이지 {page} 요청 중...")
 
-        for card in product_cards:
-            if len(results) >= limit:
+            # 첫 페이지만 HTML 저장
+            html = fetch_search_page_html(keyword, page=page, save_html=(save_html and page == 1))
+            if not html:
+                print("⚠️ 검색 페이지 응답이 비어있습니다. 크롤링 종료.")
                 break
 
-            link = card["link"]
-            location_from_search = card["location"]
-            time_from_search = card["time"]
-
-            # 첫 상품만 HTML 저장
-            save_detail_html = (len(results) == 0 and globals().get('SAVE_HTML', False))
-            detail = parse_product_page(link, save_html=save_detail_html)
-            if not detail:
-                continue
-
-            # 상세 페이지에서 가져온 정보 우선 사용, 없으면 검색 페이지 정보 사용
-            location = detail.get("location", "지역없음")
-            if location == "지역없음":
-                location = location_from_search
-
-            time_val = detail.get("time", "시간없음")
-            if time_val == "시간없음":
-                time_val = time_from_search
-
-            row = {
-                "name": detail["name"],
-                "price": detail["price"],
-                "location": location,
-                "time": time_val,
-                "link": link,
-            }
-
-            print(
-                f"✅ {row['name']} / {row['price']}원 / "
-                f"{row['location']} / {row['time']}"
-            )
+            # 첫 페이지만 디버그 출력
+            product_cards = extract_products_from_search(html, debug=(debug and page == 1))
+            if not product_cards:
+                print("⚠️ 더 이상 상품 카드가 없습니다. 크롤링 종료.")
+                break
 
-            results.append(row)
+            _collect_details(executor, product_cards, results, limit, save_html=save_html)
 
-            time.sleep(random.uniform(*sleep_range))  # 상세 페이지 크롤링 간 딜레이
+            page += 1
+            time.sleep(random.uniform(*sleep_range))  # 페이지 전환 딜레이
 
-        page += 1
-        time.sleep(random.uniform(*sleep_range))  # 페이지 전환 딜레이
+    finally:
+        executor.shutdown(wait=True)
 
     return results
 
@@ -788,6 +929,7 @@ if __name__ == "__main__":
     parser.add_argument("--no-headless", action="store_true", help="브라우저 창 표시")
     parser.add_argument("--save-html", action="store_true", help="HTML 파일 저장")
     parser.add_argument("--no-selenium", action="store_true", help="requests 사용 (Selenium 비활성화)")
+    parser.add_argument("--no-api", action="store_true", help="API 우선 수집 건너뛰고 바로 HTML 크롤링")
     parser.add_argument("--save-db", action="store_true", help="데이터베이스에 저장")
     parser.add_argument("--category", type=str, default="iPhone", help="카테고리명 (기본값: iPhone)")
     parser.add_argument("--no-csv", action="store_true", help="CSV 파일 저장 안 함")
@@ -809,16 +951,39 @@ if __name__ == "__main__":
     print(f"수집 개수: {LIMIT}개")
     print("=" * 60 + "\n")
 
-    if USE_SELENIUM:
-        data = crawl_search_selenium(
-            keyword=KEYWORD,
-            limit=LIMIT,
-            sleep_range=(0.5, 1.5),
-            debug=DEBUG,
-            headless=HEADLESS
-        )
-    else:
-        data = crawl_search_results(keyword=KEYWORD, limit=LIMIT, sleep_range=(0.5, 1.5), debug=DEBUG)
+    data: List[dict] = []
+    version_tag, version_text = "api", "API 버전"
+
+    try:
+        # API 한 번이면 name/price/location/time/link가 모두 오므로 우선 시도
+        # 실패하거나 비어 있을 때만 상세 페이지까지 도는 HTML 크롤링으로 폴백
+        if not args.no_api:
+            try:
+                data = crawl_search_api(keyword=KEYWORD, limit=LIMIT, sleep_range=(0.5, 1.5), debug=DEBUG)
+            except Exception as e:
+                print(f"❌ API 크롤링 실패, HTML 크롤링으로 전환: {e}")
+                data = []
+
+        if data:
+            print("\n✅ API로 수집 완료, HTML 크롤링 생략")
+        elif USE_SELENIUM:
+            version_tag, version_text = "selenium", "Selenium 버전"
+            data = crawl_search_selenium(
+                keyword=KEYWORD,
+                limit=LIMIT,
+                sleep_range=(0.5, 1.5),
+                debug=DEBUG,
+                headless=HEADLESS,
+                save_html=SAVE_HTML,
+            )
+        else:
+            version_tag, version_text = "requests", "requests 버전"
+            data = crawl_search_results(
+                keyword=KEYWORD, limit=LIMIT, sleep_range=(0.5, 1.5), debug=DEBUG, save_html=SAVE_HTML
+            )
+    finally:
+        SESSION.close()
+        API_SESSION.close()
 
     if not data:
         print(f"\n'{KEYWORD}' 검색 결과가 없습니다.")
@@ -830,15 +995,13 @@ if __name__ == "__main__":
 
     # CSV 저장
     if not args.no_csv:
-        df = pd.DataFrame(data)
-        if USE_SELENIUM:
-            out_csv = f"{KEYWORD}_products_selenium.csv"
-            version_text = "Selenium 버전"
-        else:
-            out_csv = f"{KEYWORD}_products_requests.csv"
-            version_text = "requests 버전"
+        out_csv = f"{KEYWORD}_products_{version_tag}.csv"
 
-        df.to_csv(out_csv, encoding="utf-8-sig", index=False)
+        with open(out_csv, "w", encoding="utf-8-sig", newline="") as f:
+            # 컬럼이 고정돼 있으니 DictWriter 대신 tuple로 뽑아 csv.writer로 바로 씀
+            w = csv.writer(f)
+            w.writerow(CSV_COLS)
+            w.writerows(map(itemgetter(*CSV_COLS), data))
         print(f"📁 CSV 저장 완료: {os.path.abspath(out_csv)} ({version_text})")
 
     # 데이터베이스 저장
@@ -1,124 +1,148 @@
 # app/db/crud.py
 from __future__ import annotations
-from typing import Optional, List, Sequence
+from collections import OrderedDict
+from typing import Dict, Optional, List, Tuple
 from datetime import datetime, timedelta, timezone
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc, and_
+from sqlalchemy import select, desc, and_, func, true
 
+from app.core.cache import TTLCache
+from app.core.fingerprint import spec_fingerprint
 from app.schemas.price import (
     SummaryInfo, DistrictDetail, RegionalAnalysis,
     ChartDataPoint, PriceTrend, Listing, SpecRequest, RegionRequest
 )
 from app.db.models import (
     Category, Sku, SkuAttribute, Attribute,
-    Sd, Sgg, Emd, PriceStats, Item
+    Sd, Sgg, Emd, PriceStats, PriceStatsLatest, Item
 )
 
 # ---------------------------------------------------------------------
-# Helpers
+# Stats result cache
 # ---------------------------------------------------------------------
-def generate_fingerprint(spec_dict: dict) -> str:
-    """
-    스펙 딕셔너리로부터 SKU 식별용 fingerprint 생성
+# price_stats는 수집 주기마다만 바뀌므로 최신 버킷 조회 결과를 프로세스 안에서 잠깐 재사용
+# (워커별 캐시 - 새 통계가 적재되면 invalidate_stats_cache()로 비움)
+STATS_CACHE_TTL = 300  # 초
+_stats_cache = TTLCache(STATS_CACHE_TTL)
 
-    Args:
-        spec_dict: {'model': 'iPhone 13', 'color': 'Blue', 'storage': '256GB'} 형태의 사전
 
-    Returns:
-        32자 길이의 해시 문자열(전역 유일도 확보용)
-    """
-    import hashlib
-    sorted_attrs = sorted(spec_dict.items())
-    attr_string = "|".join(f"{k}:{v}" for k, v in sorted_attrs)
-    return hashlib.sha256(attr_string.encode("utf-8")).hexdigest()[:32]
+def invalidate_stats_cache() -> None:
+    """price_stats 갱신 후 호출 - 요약/지역분석 캐시 전체 삭제"""
+    _stats_cache.clear()
 
 
-async def get_model_name_from_sku(db: AsyncSession, sku: Sku) -> str:
-    """
-    SKU의 표시용 모델명 구성
+# ---------------------------------------------------------------------
+# SKU resolution cache
+# ---------------------------------------------------------------------
+# (product, spec) → sku_id 는 한 번 정해지면 바뀌지 않으므로 프로세스 안에서 재사용
+# 없는(None) 결과는 나중에 SKU가 생길 수 있어 캐시하지 않음
+SKU_ID_CACHE_SIZE = 50_000
+_sku_id_cache: "OrderedDict[Tuple[str, frozenset], int]" = OrderedDict()
+_category_ids: Dict[str, int] = {}
 
-    - SKU에 연결된 속성(SkuAttribute + Attribute.code)을 읽어
-      사람이 보기 좋은 문자열로 결합합니다. (필요 시 규칙을 커스터마이즈)
 
-    Args:
-        db: AsyncSession
-        sku: 대상 SKU 객체
+def invalidate_sku_cache() -> None:
+    """카테고리/SKU 구성이 바뀌었을 때 호출"""
+    _sku_id_cache.clear()
+    _category_ids.clear()
 
-    Returns:
-        모델명 문자열(예: "iPhone 13 Blue 256GB"). 속성이 없으면 "Unknown Model"
-    """
+
+async def _get_category_id(db: AsyncSession, name: str) -> Optional[int]:
+    category_id = _category_ids.get(name)
+    if category_id is None:
+        category_id = (
+            await db.execute(select(Category.category_id).where(Category.name == name))
+        ).scalar_one_or_none()
+        if category_id is not None:
+            _category_ids[name] = category_id
+    return category_id
+
+
+# ---------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------
+async def _query_model_name(db: AsyncSession, sku_id: int) -> str:
+    """display_name이 비어 있는(이전에 생성된) SKU용 - 속성을 조회해 모델명 조합"""
     q = (
-        select(SkuAttribute, Attribute)
+        select(SkuAttribute.value_text, SkuAttribute.value_int, SkuAttribute.value_bool)
         .join(Attribute, Attribute.attribute_id == SkuAttribute.attribute_id)
-        .where(SkuAttribute.sku_id == sku.sku_id)
+        .where(SkuAttribute.sku_id == sku_id)
         .order_by(Attribute.code.asc())
     )
-    rows = (await db.execute(q)).all()
+    return _join_model_name((await db.execute(q)).all())
+
+
+def _fmt_bucket_ts(ts: datetime) -> str:
+    """bucket_ts → 'YYYY-MM-DD HH:MM' (strftime보다 빠른 C 구현 isoformat 사용, tz 표기는 제외)"""
+    return ts.replace(tzinfo=None).isoformat(" ", "minutes")
+
+
+def _join_model_name(values) -> str:
+    """(value_text, value_int, value_bool) 튜플들을 모델명 문자열로 결합"""
     parts: List[str] = []
-    for sa, at in rows:
-        if sa.value_text:
-            parts.append(sa.value_text)
-        elif sa.value_int is not None:
-            parts.append(str(sa.value_int))
-        elif sa.value_bool is not None:
-            parts.append("Yes" if sa.value_bool else "No")
+    for value_text, value_int, value_bool in values:
+        if value_text:
+            parts.append(value_text)
+        elif value_int is not None:
+            parts.append(str(value_int))
+        elif value_bool is not None:
+            parts.append("Yes" if value_bool else "No")
     return " ".join(parts) if parts else "Unknown Model"
 
 
 # ---------------------------------------------------------------------
 # CRUD: SKU / Region
 # ---------------------------------------------------------------------
-async def get_sku_by_specs(db: AsyncSession, product: str, spec: SpecRequest) -> Optional[Sku]:
+async def get_sku_id_by_specs(db: AsyncSession, product: str, spec: SpecRequest) -> Optional[int]:
     """
-    제품 카테고리와 스펙으로 SKU 조회
+    제품 카테고리와 스펙으로 sku_id 조회 (결과를 LRU로 캐시)
 
-    - 카테고리 테이블에서 product 이름으로 category_id를 찾고
-    - spec(모델/색상/용량 등)으로 fingerprint를 만든 뒤
-    - (category_id, fingerprint) 조합으로 SKU를 조회합니다.
-      (필요 시, 없으면 생성하는 upsert 로직으로 확장 가능)
+    - product 이름으로 category_id를 찾고, spec으로 fingerprint를 만든 뒤
+      (category_id, fingerprint) 조합으로 SKU를 찾습니다.
 
-    Args:
-        db: Database AsyncSession
-        product: 제품 카테고리명 (예: "iPhone", "MacBook", ...)
-        spec: 제품 스펙(모델/색상/용량 등이 들어있는 Pydantic 모델)
+    - 캐시 히트면 DB 왕복 없음
+    - 카테고리명 → category_id도 따로 캐시
 
     Returns:
-        SKU 객체 또는 None
+        sku_id 또는 None
     """
-    category = (await db.execute(select(Category).where(Category.name == product))).scalar_one_or_none()
-    if not category:
-        return None
-
-    # 필드명 매핑(예: storage -> capacity) 필요 시 여기에서 처리
-    field_mapping = {"storage": "capacity"}
-    spec_dict = {field_mapping.get(k, k): v for k, v in spec.model_dump().items() if v is not None}
+    spec_dict = _spec_to_dict(spec)
     if not spec_dict:
         return None
 
-    fp = generate_fingerprint(spec_dict)
-    q = select(Sku).where(and_(Sku.category_id == category.category_id, Sku.fingerprint == fp))
-    return (await db.execute(q)).scalar_one_or_none()
+    key = (product, frozenset(spec_dict.items()))
+    sku_id = _sku_id_cache.get(key)
+    if sku_id is not None:
+        _sku_id_cache.move_to_end(key)
+        return sku_id
 
+    category_id = await _get_category_id(db, product)
+    if category_id is None:
+        return None
 
-async def get_region_by_name(db: AsyncSession, region: RegionRequest) -> Optional[Emd]:
-    """
-    RegionRequest(sd/sgg/emd)로 읍면동(Emd) 단위 지역을 조회
+    fp = spec_fingerprint(spec_dict)
+    q = select(Sku.sku_id).where(and_(Sku.category_id == category_id, Sku.fingerprint == fp))
+    sku_id = (await db.execute(q)).scalar_one_or_none()
+    if sku_id is not None:
+        _sku_id_cache[key] = sku_id
+        if len(_sku_id_cache) > SKU_ID_CACHE_SIZE:
+            _sku_id_cache.popitem(last=False)
+    return sku_id
 
-    - sd(시도) + sgg(시군구) + emd(읍면동) 조합으로 가장 구체적인 지역을 찾습니다.
-    - 데이터가 불완전하면 None을 반환합니다.
 
-    Args:
-        db: AsyncSession
-        region: RegionRequest(sd/sgg/emd 중 일부 또는 전체)
+def _spec_to_dict(spec: SpecRequest) -> dict:
+    # 필드명 매핑(예: storage -> capacity) 필요 시 여기에서 처리
+    field_mapping = {"storage": "capacity"}
+    return {field_mapping.get(k, k): v for k, v in spec.model_dump().items() if v is not None}
 
-    Returns:
-        Emd 객체 또는 None
-    """
+
+async def get_region_id_by_name(db: AsyncSession, region: RegionRequest) -> Optional[int]:
+    """RegionRequest(sd/sgg/emd)로 가장 구체적인 읍면동의 region_id 조회 (ORM 객체 생성 없음)"""
     if not (region.sd or region.sgg or region.emd):
         return None
 
-    q = select(Emd).join(Sgg, Sgg.sgg_id == Emd.sgg_id)
+    q = select(Emd.region_id).join(Sgg, Sgg.sgg_id == Emd.sgg_id)
 
     if region.sd:
         q = q.join(Sd, Sd.sd_id == Sgg.sd_id).where(Sd.name == region.sd)
@@ -130,21 +154,12 @@ async def get_region_by_name(db: AsyncSession, region: RegionRequest) -> Optiona
     return (await db.execute(q)).scalar_one_or_none()
 
 
-async def get_sgg_by_name(db: AsyncSession, region: RegionRequest) -> Optional[Sgg]:
-    """
-    RegionRequest(sd, sgg)로 시군구(Sgg) 조회
-
-    Args:
-        db: AsyncSession
-        region: RegionRequest(sd, sgg 필드 사용)
-
-    Returns:
-        Sgg 객체 또는 None
-    """
+async def get_sgg_id_by_name(db: AsyncSession, region: RegionRequest) -> Optional[int]:
+    """RegionRequest(sd, sgg)로 시군구 sgg_id 조회 (ORM 객체 생성 없음)"""
     if not (region.sd and region.sgg):
         return None
     q = (
-        select(Sgg)
+        select(Sgg.sgg_id)
         .join(Sd, Sd.sd_id == Sgg.sd_id)
         .where(and_(Sd.name == region.sd, Sgg.name == region.sgg))
     )
@@ -158,8 +173,10 @@ async def get_summary_info(db: AsyncSession, sku_id: int, region_id: Optional[in
     """
     요약 통계 조회(판매중 기준): 평균가/최고가/최저가/매물수 + 모델명/데이터시각
 
-    - price_stats에서 (sku_id, [region_id])의 최신 버킷 1건을 조회
-    - SKU 속성을 조합해 model_name을 생성
+    - price_stats_latest에서 (sku_id, [region_id])의 최신 버킷 1건을 조회
+      (아직 갱신되지 않아 행이 없으면 price_stats에서 직접 조회)
+    - model_name은 sku.display_name 사용 (비어 있으면 속성을 조합)
+    - 최신 통계(서브쿼리)와 display_name을 한 번의 쿼리로 가져옴
 
     Args:
         db: AsyncSession
@@ -169,17 +186,27 @@ async def get_summary_info(db: AsyncSession, sku_id: int, region_id: Optional[in
     Returns:
         SummaryInfo Pydantic 모델
     """
-    q = select(PriceStats).where(PriceStats.sku_id == sku_id)
-    if region_id is not None:
-        q = q.where(PriceStats.region_id == region_id)
-    q = q.order_by(desc(PriceStats.bucket_ts)).limit(1)
-    stat = (await db.execute(q)).scalar_one_or_none()
-
-    sku = (await db.execute(select(Sku).where(Sku.sku_id == sku_id))).scalar_one_or_none()
-    model_name = await get_model_name_from_sku(db, sku) if sku else "Unknown"
+    cache_key = ("summary", sku_id, region_id)
+    cached = _stats_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # price_stats_latest: (sku, region)별 최신 버킷만 들어 있음
+    # - region 지정 시 PK 조회, 전체면 해당 sku의 지역 수만큼만 정렬
+    row = await _summary_row(db, PriceStatsLatest, sku_id, region_id)
+    if row is not None and row.bucket_ts is None:
+        # 배포 직후/갱신 전이라 최신 테이블이 비어 있으면 원본 통계로 폴백
+        row = await _summary_row(db, PriceStats, sku_id, region_id)
+
+    if row is None:
+        model_name = "Unknown"
+        stat = None
+    else:
+        model_name = row.display_name or await _query_model_name(db, sku_id)
+        stat = row if row.bucket_ts is not None else None
 
     if not stat:
-        return SummaryInfo(
+        summary = SummaryInfo(
             model_name=model_name,
             average_price=0,
             highest_listing_price=0,
@@ -187,22 +214,49 @@ async def get_summary_info(db: AsyncSession, sku_id: int, region_id: Optional[in
             listing_count=0,
             data_date=None,
         )
+    else:
+        summary = SummaryInfo(
+            model_name=model_name,
+            average_price=int(stat.avg_price) if stat.avg_price is not None else 0,
+            highest_listing_price=stat.max_price or 0,
+            lowest_listing_price=stat.min_price or 0,
+            listing_count=stat.items_num,
+            data_date=_fmt_bucket_ts(stat.bucket_ts),
+        )
+
+    _stats_cache.put(cache_key, summary)
+    return summary
 
-    return SummaryInfo(
-        model_name=model_name,
-        average_price=int(stat.avg_price) if stat.avg_price is not None else 0,
-        highest_listing_price=stat.max_price or 0,
-        lowest_listing_price=stat.min_price or 0,
-        listing_count=stat.items_num,
-        data_date=stat.bucket_ts.strftime("%Y-%m-%d %H:%M"),
+
+async def _summary_row(db: AsyncSession, model, sku_id: int, region_id: Optional[int]):
+    """SKU 1행에 model(PriceStatsLatest/PriceStats)의 최신 버킷 1행을 붙여 조회"""
+    stat_q = select(
+        model.avg_price,
+        model.max_price,
+        model.min_price,
+        model.items_num,
+        model.bucket_ts,
+    ).where(model.sku_id == sku_id)
+    if region_id is not None:
+        stat_q = stat_q.where(model.region_id == region_id)
+    stat_sq = stat_q.order_by(desc(model.bucket_ts)).limit(1).subquery()
+
+    # 통계가 없어도 SKU 행은 남도록 outer join
+    q = (
+        select(Sku.display_name, *stat_sq.c)
+        .select_from(Sku)
+        .outerjoin(stat_sq, true())
+        .where(Sku.sku_id == sku_id)
     )
+    return (await db.execute(q)).first()
 
 
 async def get_regional_analysis(db: AsyncSession, sku_id: int, sgg_id: int) -> RegionalAnalysis:
     """
     시군구 단위(=sgg_id)로 읍면동별 최신 평균가/매물수 조회
 
-    - sgg 내 각 emd(region_id)에 대해 price_stats의 최신 버킷을 조인
+    - sgg 내 각 emd(region_id)에 대해 price_stats_latest(최신 버킷)를 조인
+      (아직 갱신되지 않아 행이 없으면 price_stats의 최신 버킷으로 폴백)
     - 동별 평균가/매물수를 DistrictDetail 리스트로 반환
 
     Args:
@@ -213,6 +267,37 @@ async def get_regional_analysis(db: AsyncSession, sku_id: int, sgg_id: int) -> R
     Returns:
         RegionalAnalysis(detail_by_district=List[DistrictDetail])
     """
+    cache_key = ("regional", sku_id, sgg_id)
+    cached = _stats_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # 동별 최신 버킷은 price_stats_latest에 이미 있으므로 MAX 서브쿼리 없이 조인만
+    q = (
+        select(Emd.name, PriceStatsLatest.avg_price, PriceStatsLatest.items_num)
+        .join(PriceStatsLatest, PriceStatsLatest.region_id == Emd.region_id)
+        .where(PriceStatsLatest.sku_id == sku_id, Emd.sgg_id == sgg_id)
+        .order_by(Emd.name.asc())
+    )
+
+    rows = (await db.execute(q)).all()
+    if not rows:
+        rows = (await db.execute(_regional_from_price_stats(sku_id, sgg_id))).all()
+    details = [
+        DistrictDetail(
+            emd=name,
+            average_price=int(avg) if avg is not None else 0,
+            listing_count=cnt or 0,
+        )
+        for (name, avg, cnt) in rows
+    ]
+    analysis = RegionalAnalysis(detail_by_district=details)
+    _stats_cache.put(cache_key, analysis)
+    return analysis
+
+
+def _regional_from_price_stats(sku_id: int, sgg_id: int):
+    """price_stats_latest가 비어 있을 때용 - price_stats에서 동별 최신 버킷을 직접 찾는 쿼리"""
     latest_subq = (
         select(
             PriceStats.region_id.label("region_id"),
@@ -223,8 +308,7 @@ async def get_regional_analysis(db: AsyncSession, sku_id: int, sgg_id: int) -> R
         .group_by(PriceStats.region_id)
         .subquery()
     )
-
-    q = (
+    return (
         select(Emd.name, PriceStats.avg_price, PriceStats.items_num)
         .join(latest_subq, latest_subq.c.region_id == Emd.region_id)
         .join(
@@ -239,17 +323,6 @@ async def get_regional_analysis(db: AsyncSession, sku_id: int, sgg_id: int) -> R
         .order_by(Emd.name.asc())
     )
 
-    rows = (await db.execute(q)).all()
-    details = [
-        DistrictDetail(
-            emd=name,
-            average_price=int(avg) if avg is not None else 0,
-            listing_count=cnt or 0,
-        )
-        for (name, avg, cnt) in rows
-    ]
-    return RegionalAnalysis(detail_by_district=details)
-
 
 async def get_price_trend(
     db: AsyncSession,
@@ -275,7 +348,8 @@ async def get_price_trend(
     """
     start_dt = datetime.now(tz=timezone.utc) - timedelta(weeks=weeks)
 
-    q = select(PriceStats).where(
+    # 필요한 두 컬럼만 튜플로 가져옴 (ORM 엔티티 생성 비용 없음)
+    q = select(PriceStats.bucket_ts, PriceStats.avg_price).where(
         PriceStats.sku_id == sku_id,
         PriceStats.bucket_ts >= start_dt,
     )
@@ -283,20 +357,20 @@ async def get_price_trend(
         q = q.where(PriceStats.region_id == region_id)
     q = q.order_by(PriceStats.bucket_ts.asc())
 
-    rows = (await db.execute(q)).scalars().all()
+    rows = (await db.execute(q)).all()
     if len(rows) < 2:
         return PriceTrend(trend_period=weeks, change_rate=0.0, chart_data=[])
 
-    first = float(rows[0].avg_price or 0)
-    last = float(rows[-1].avg_price or 0)
+    first = float(rows[0][1] or 0)
+    last = float(rows[-1][1] or 0)
     change_rate = ((last - first) / first * 100.0) if first > 0 else 0.0
 
     chart = [
         ChartDataPoint(
-            period=row.bucket_ts.strftime("%Y-%m-%d %H:%M"),
-            price=int(row.avg_price) if row.avg_price is not None else 0,
+            period=_fmt_bucket_ts(bucket_ts),
+            price=int(avg_price) if avg_price is not None else 0,
         )
-        for row in rows
+        for bucket_ts, avg_price in rows
     ]
     return PriceTrend(trend_period=weeks, change_rate=round(change_rate, 2), chart_data=chart)
 
@@ -312,7 +386,7 @@ async def get_lowest_price_listings(
 
     - items에서 sku_id(+시군구 범위)가 일치하는 레코드를 최저가 순으로 조회
     - 지역명(시군구/읍면동)과 출처/링크를 포함해 Listing 리스트로 반환
-    - N+1 최소화를 위해 emd/sgg를 배치 조회
+    - emd/sgg는 같은 쿼리에서 조인해 왕복 1회로 처리
 
     Args:
         db: AsyncSession
@@ -323,36 +397,26 @@ async def get_lowest_price_listings(
     Returns:
         List[Listing]
     """
-    q = select(Item).where(Item.sku_id == sku_id, Item.status == "판매중")
+    # 매물 + 읍면동/시군구 이름을 한 번의 조인으로 조회 (limit이 작아 조인 비용이 거의 없음)
+    q = (
+        select(Item.price, Item.url, Item.source, Emd.name.label("emd_name"), Sgg.name.label("sgg_name"))
+        .outerjoin(Emd, Emd.region_id == Item.region_id)
+        .outerjoin(Sgg, Sgg.sgg_id == Emd.sgg_id)
+        .where(Item.sku_id == sku_id, Item.status == "판매중")
+    )
     if sgg_id is not None:
-        q = q.join(Emd, Emd.region_id == Item.region_id).where(Emd.sgg_id == sgg_id)
+        q = q.where(Emd.sgg_id == sgg_id)
     q = q.order_by(Item.price.asc()).limit(limit)
 
-    items = (await db.execute(q)).scalars().all()
-    if not items:
-        return []
-
-    region_ids = {it.region_id for it in items if it.region_id is not None}
-    emd_map: dict[int, Emd] = {}
-    sgg_map: dict[int, Sgg] = {}
-
-    if region_ids:
-        emd_rows = (await db.execute(select(Emd).where(Emd.region_id.in_(region_ids)))).scalars().all()
-        emd_map = {e.region_id: e for e in emd_rows}
-        sgg_ids = {e.sgg_id for e in emd_rows}
-        if sgg_ids:
-            sgg_rows = (await db.execute(select(Sgg).where(Sgg.sgg_id.in_(sgg_ids)))).scalars().all()
-            sgg_map = {s.sgg_id: s for s in sgg_rows}
+    rows = (await db.execute(q)).all()
 
     results: List[Listing] = []
-    for it in items:
-        emd = emd_map.get(it.region_id)
-        sgg = sgg_map.get(emd.sgg_id) if emd else None
-        district = f"{sgg.name} {emd.name}" if (sgg and emd) else (emd.name if emd else "Unknown")
+    for price, url, source, emd_name, sgg_name in rows:
+        district = f"{sgg_name} {emd_name}" if (sgg_name and emd_name) else (emd_name or "Unknown")
         results.append(Listing(
-            listing_price=it.price,
+            listing_price=price,
             district_detail=district,
-            source=getattr(it, "source", "unknown"),
-            source_url=it.url or "",
+            source=source or "unknown",
+            source_url=url or "",
         ))
     return results
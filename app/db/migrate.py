@@ -0,0 +1,98 @@
+# app/db/migrate.py
+"""
+기동 시 기존 DB를 현재 모델에 맞추는 멱등 스키마 보정
+
+- schema_new.sql로 새로 만든 DB에는 아무것도 하지 않음 (이미 있는 컬럼/테이블/인덱스는 건너뜀)
+- sku.display_name 컬럼 추가 + 비어 있는 SKU 모델명 백필
+- price_stats_latest 테이블, 최저가/가격추이용 인덱스 생성 + price_stats에서 초기 적재
+"""
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, inspect, select, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.db.crud import _join_model_name
+from app.db.models import Attribute, Item, PriceStats, PriceStatsLatest, Sku, SkuAttribute
+from app.db.session import engine
+from app.services.sku_pipline import refresh_price_stats_latest
+
+logger = get_logger(__name__)
+
+# 여러 워커가 동시에 기동해도 DDL은 한 번만 돌도록 잡는 Postgres advisory lock 키
+MIGRATE_ADVISORY_LOCK_KEY = 0x486F7744  # "HowD"
+
+
+def _ensure_ddl(conn: Connection) -> Optional[bool]:
+    """
+    빠진 컬럼/테이블/인덱스를 만든다.
+
+    Returns:
+        price_stats_latest를 이번에 새로 만들었으면 True (초기 적재 필요),
+        스키마 자체가 없으면(schema_new.sql 적용 전) None
+    """
+    insp = inspect(conn)
+    tables = set(insp.get_table_names())
+    if "sku" not in tables:
+        return None
+
+    if "display_name" not in {c["name"] for c in insp.get_columns("sku")}:
+        conn.execute(text("ALTER TABLE sku ADD COLUMN display_name VARCHAR(255)"))
+        logger.info("[migrate] sku.display_name 추가")
+
+    created = "price_stats_latest" not in tables
+    PriceStatsLatest.__table__.create(conn, checkfirst=True)
+
+    for table in (Item.__table__, PriceStats.__table__):
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+    return created
+
+
+async def _backfill_display_names(session: AsyncSession) -> int:
+    """display_name이 비어 있는 SKU에 속성(Attribute.code 순)을 이어 붙인 모델명을 채움"""
+    q = (
+        select(Sku.sku_id, SkuAttribute.value_text, SkuAttribute.value_int, SkuAttribute.value_bool)
+        .join(SkuAttribute, SkuAttribute.sku_id == Sku.sku_id)
+        .join(Attribute, Attribute.attribute_id == SkuAttribute.attribute_id)
+        .where(Sku.display_name.is_(None))
+        .order_by(Sku.sku_id, Attribute.code.asc())
+    )
+    values: Dict[int, List[Tuple]] = {}
+    for sku_id, value_text, value_int, value_bool in (await session.execute(q)).all():
+        values.setdefault(sku_id, []).append((value_text, value_int, value_bool))
+
+    params = [
+        {"b_sku_id": sku_id, "b_name": name[:255]}
+        for sku_id, vals in values.items()
+        if (name := _join_model_name(vals)) != "Unknown Model"
+    ]
+    if params:
+        stmt = (
+            update(Sku.__table__)
+            .where(Sku.__table__.c.sku_id == bindparam("b_sku_id"))
+            .values(display_name=bindparam("b_name"))
+        )
+        await session.execute(stmt, params)
+    return len(params)
+
+
+async def ensure_schema() -> None:
+    """lifespan에서 기동 시 1회 호출"""
+    async with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            # 트랜잭션이 끝나면 자동 해제 (DDL도 같은 트랜잭션이라 다른 워커는 끝난 결과를 봄)
+            await conn.execute(text("SELECT pg_advisory_xact_lock(:k)"), {"k": MIGRATE_ADVISORY_LOCK_KEY})
+
+        created = await conn.run_sync(_ensure_ddl)
+        if created is None:
+            return
+
+        async with AsyncSession(bind=conn) as session:
+            filled = await _backfill_display_names(session)
+            if filled:
+                logger.info("[migrate] display_name 백필: %d SKUs", filled)
+            if created:
+                await refresh_price_stats_latest(session)
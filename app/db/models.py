@@ -7,7 +7,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from sqlalchemy import UniqueConstraint, CheckConstraint
+from sqlalchemy import UniqueConstraint, CheckConstraint, Index
 from app.db.session import Base
 import enum
 
@@ -72,7 +72,8 @@ class Emd(Base):
     name = Column(String(50), nullable=False)
 
     # Relationships
-    sgg = relationship("Sgg", back_populates="emds")
+    # 비동기 세션에서 암묵적 lazy load는 실패하므로, 필요하면 조인/selectinload로 명시해서 읽도록 강제
+    sgg = relationship("Sgg", back_populates="emds", lazy="raise")
     items = relationship("Item", back_populates="region")
     price_stats = relationship("PriceStats", back_populates="region")
 
@@ -164,7 +165,13 @@ class Item(Base):
 
     source = Column(String(20), nullable=False, default="daangn")
     external_id = Column(String(100), nullable=False)
-    __table_args__ = (UniqueConstraint("source", "external_id", name="ux_items_source_external"),)
+    __table_args__ = (
+        UniqueConstraint("source", "external_id", name="ux_items_source_external"),
+        # 최저가 매물 조회: sku + 상태 필터 후 가격순 top-N
+        Index("idx_items_sku_status_price", "sku_id", "status", "price"),
+        # 지역 지정 최저가: sku + 상태 + 읍면동 필터 후 가격순 top-N
+        Index("idx_items_sku_status_region_price", "sku_id", "status", "region_id", "price"),
+    )
 
 
     created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
@@ -172,7 +179,7 @@ class Item(Base):
 
     # Relationships
     sku     = relationship("Sku", back_populates="items")
-    region = relationship("Emd", back_populates="items")
+    region = relationship("Emd", back_populates="items", lazy="raise")  # Item → Emd → Sgg 경로는 명시적 로딩만 허용
     category = relationship("Category", back_populates="items")
     item_attribute_values = relationship("ItemAttributeValue", back_populates="item")
 
@@ -213,6 +220,8 @@ class Sku(Base):
     sku_id = Column(BIGINT, primary_key=True, autoincrement=True)
     category_id = Column(Integer, ForeignKey("category.category_id", ondelete="RESTRICT"), nullable=False)
     fingerprint = Column(String(255), nullable=False, unique=True)
+    # 표시용 모델명 (속성 값을 Attribute.code 순으로 이어 붙인 것, SKU 생성 시 저장)
+    display_name = Column(String(255))
 
     # Relationships
     category = relationship("Category", back_populates="skus")
@@ -262,6 +271,25 @@ class PriceStats(Base):
     min_price = Column(Integer)
     max_price = Column(Integer)
 
+    __table_args__ = (
+        # 최신 버킷/기간 조회가 정렬 없이 인덱스 스캔으로 끝나도록
+        Index("idx_price_stats_sku_bucket", sku_id, bucket_ts.desc()),
+        Index("idx_price_stats_sku_region_bucket", sku_id, region_id, bucket_ts.desc()),
+    )
+
     # Relationships
     sku = relationship("Sku", back_populates="price_stats")
     region = relationship("Emd", back_populates="price_stats")
+
+
+class PriceStatsLatest(Base):
+    """(sku, region)별 최신 버킷 가격 통계 - price_stats 적재 시 함께 갱신"""
+    __tablename__ = "price_stats_latest"
+
+    sku_id = Column(BIGINT, ForeignKey("sku.sku_id", ondelete="CASCADE"), primary_key=True)
+    region_id = Column(Integer, ForeignKey("emd.region_id", ondelete="CASCADE"), primary_key=True)
+    bucket_ts = Column(TIMESTAMP(timezone=True), nullable=False)
+    items_num = Column(Integer, nullable=False, default=0)
+    avg_price = Column(Numeric(18, 2))
+    min_price = Column(Integer)
+    max_price = Column(Integer)
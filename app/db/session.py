@@ -1,26 +1,66 @@
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import text
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from app.core.config import get_settings
 
 settings = get_settings()
 
-SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./howmuch.db"
-
-engine = create_async_engine(
-    SQLALCHEMY_DATABASE_URL,
-    future=True,
-    echo=False,               # 디버그 시 True
-    pool_pre_ping=True,
+# pgbouncer 경유 시에는 .env 의 DATABASE_URL(Postgres)을 사용, 그 외에는 로컬 SQLite
+SQLALCHEMY_DATABASE_URL = (
+    str(settings.DATABASE_URL) if settings.PGBOUNCER else "sqlite+aiosqlite:///./howmuch.db"
 )
 
-SessionLocal = sessionmaker(
+# 컴파일된 SQL 캐시 크기 (기본 500) - 반복되는 CRUD select가 매번 재컴파일되지 않도록
+QUERY_CACHE_SIZE = 1200
+
+# 1) 엔진은 프로세스당 한 번만 생성 → 커넥션 풀을 요청 간 재사용
+if settings.PGBOUNCER and make_url(SQLALCHEMY_DATABASE_URL).get_driver_name() == "asyncpg":
+    # pgbouncer(transaction 모드) 뒤에서는 풀링을 pgbouncer에 맡기고,
+    # asyncpg prepared statement 캐시를 꺼서 커넥션 간 충돌/메모리 증가를 막는다
+    # (statement_cache_size 등은 asyncpg 전용 인자라 다른 드라이버에는 넘기지 않음)
+    engine = create_async_engine(
+        SQLALCHEMY_DATABASE_URL,
+        future=True,
+        echo=False,
+        query_cache_size=QUERY_CACHE_SIZE,
+        poolclass=NullPool,
+        connect_args={"statement_cache_size": 0, "prepared_statement_cache_size": 0},
+    )
+else:
+    engine = create_async_engine(
+        SQLALCHEMY_DATABASE_URL,
+        future=True,
+        echo=False,               # 디버그 시 True
+        query_cache_size=QUERY_CACHE_SIZE,
+        poolclass=AsyncAdaptedQueuePool,  # 드라이버 기본값에 기대지 않고 큐 풀을 명시
+        pool_size=20,             # 동시 요청 대비 기본 커넥션 수
+        max_overflow=20,          # 순간 트래픽 시 추가 허용 커넥션 (동시 100요청 부하에서 풀 대기 타임아웃이 나지 않도록)
+        pool_timeout=30,
+        pool_pre_ping=True,       # 끊긴 커넥션 자동 감지/교체
+        pool_recycle=1800,        # 30분마다 커넥션 재생성 (서버/프록시 유휴 타임아웃보다 먼저 교체)
+    )
+
+# SQLite는 커넥션마다 페이지 캐시를 따로 가지므로,
+# 풀에 오래 남는 커넥션의 캐시를 키우고 WAL로 읽기/쓰기가 서로 막지 않게 한다
+if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+    @event.listens_for(engine.sync_engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA cache_size=-65536")    # 64MB
+        cur.execute("PRAGMA mmap_size=268435456")  # 256MB
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.close()
+
+# 2) 세션 팩토리
+SessionLocal = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
     expire_on_commit=False,
     autoflush=False,
-    autocommit=False,
 )
 
 # 3) Base (ORM 모델이 상속)
@@ -32,6 +72,11 @@ async def get_session():
     async with SessionLocal() as s:
         yield s
 
+# 한 요청 안에서 독립 쿼리를 병렬로 돌릴 때 쓰는 세션 팩토리 의존성
+# (AsyncSession은 동시 사용 불가 → 분기마다 새 세션을 열어야 함. 테스트에서는 dependency_overrides로 교체)
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    return SessionLocal
+
 # (선택) 헬스체크
 async def ping():
     async with engine.connect() as conn:
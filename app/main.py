@@ -3,15 +3,24 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.analytics import router as analytics_router
 from contextlib import asynccontextmanager
 from app.core.scheduler import start_scheduler, shutdown_scheduler
+from app.core.logging import setup_logging, shutdown_logging
+from app.db.session import ping
+from app.db.migrate import ensure_schema
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    start_scheduler()
+    setup_logging()
+    # 첫 요청이 커넥션 생성/PRAGMA 비용을 떠안지 않도록 기동 시 풀을 미리 열어 둠
+    await ping()
+    # 기존 DB에 새 컬럼/테이블/인덱스가 없으면 채워 넣음 (멱등)
+    await ensure_schema()
+    await start_scheduler()
     try:
         yield
     finally:
-        shutdown_scheduler()
+        await shutdown_scheduler()
+        shutdown_logging()
 
 app = FastAPI(
     title="HowMuch API",
@@ -8,18 +8,20 @@ from app.core.config import get_settings
 from app.schemas.common import MarketSource
 from app.schemas.items import RawItem
 from app.services.ingest import upsert_items
-from app.crawlers.daangn import DaangnScraper
-# from app.crawlers.joongna import JoongnaScraper
-from app.crawlers.bunjang import BunjangScraper
+# 크롤러(playwright/httpx 등)는 무거우므로 모듈 임포트 시점이 아니라 엔드포인트 호출 시 로드
 
 router = APIRouter(prefix="/crawl", tags=["crawl"])
 settings = get_settings()
 
 def get_scraper(source: MarketSource):
     if source == MarketSource.daangn:
+        from app.crawlers.daangn import DaangnScraper
         return DaangnScraper()
-    # if source == MarketSource.joongna: return JoongnaScraper()
+    # if source == MarketSource.joongna:
+    #     from app.crawlers.joongna import JoongnaScraper
+    #     return JoongnaScraper()
     if source == MarketSource.bunjang:
+        from app.crawlers.bunjang import BunjangScraper
         return BunjangScraper()
     raise HTTPException(status_code=400, detail="unsupported source")
 
@@ -34,7 +36,7 @@ async def crawl_daangn_keywords(
     - keywords 미지정 시 크롤러의 기본 키워드 사용
     - limit: 키워드별 상한
     """
-    scraper = DaangnScraper()
+    scraper = get_scraper(MarketSource.daangn)
 
     # 크롤 → RawItem 리스트
     rows: list[RawItem] = [
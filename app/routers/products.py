@@ -1,8 +1,10 @@
 # app/routers/products.py
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.db.session import get_session
+from app.db.session import get_session, get_sessionmaker
 from app.schemas.price import (
     ProductPriceRequest,
     ProductPriceResponse,
@@ -16,6 +18,7 @@ router = APIRouter(prefix="/products", tags=["products"])
 async def get_product_price(
     request: ProductPriceRequest,
     db: AsyncSession = Depends(get_session),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_sessionmaker),
 ):
     """
     제품 스펙(모델/색상/용량 등) + 지역(시/군/구/동)으로
@@ -23,31 +26,40 @@ async def get_product_price(
     """
     try:
         # 1) SKU 식별
-        sku = await crud.get_sku_by_specs(db, request.product, request.spec)
-        if not sku:
+        sku_id = await crud.get_sku_id_by_specs(db, request.product, request.spec)
+        if sku_id is None:
             return ProductPriceResponse(status="error", message="조건에 맞는 제품이 없습니다.")
 
         # 2) 지역 식별(읍면동/시군구)
-        region = await crud.get_region_by_name(db, request.region)
-        region_id = region.region_id if region else None
+        region_id = await crud.get_region_id_by_name(db, request.region)
+        sgg_id = await crud.get_sgg_id_by_name(db, request.region)
 
-        sgg = await crud.get_sgg_by_name(db, request.region)
-        sgg_id = sgg.sgg_id if sgg else None
+        # 3~6) 요약/지역분석/추이/최저가는 서로 의존성이 없으므로 동시에 조회
+        #      AsyncSession은 동시 사용이 안 되므로 쿼리마다 세션을 따로 연다
+        async def _summary():
+            # 요약 통계(평균/최고/최저/개수) — 판매중 기준
+            async with session_factory() as s:
+                return await crud.get_summary_info(s, sku_id=sku_id, region_id=region_id)
 
-        # 3) 요약 통계(평균/최고/최저/개수) — 판매중 기준
-        summary = await crud.get_summary_info(db, sku_id=sku.sku_id, region_id=region_id)
+        async def _regional():
+            # 지역 분석(시군구 묶음 → 동별 평균가 TOP/N)
+            if sgg_id is None:
+                return None
+            async with session_factory() as s:
+                return await crud.get_regional_analysis(s, sku_id=sku_id, sgg_id=sgg_id)
 
-        # 4) 지역 분석(시군구 묶음 → 동별 평균가 TOP/N)
-        regional_analysis = None
-        if sgg_id is not None:
-            regional_analysis = await crud.get_regional_analysis(db, sku_id=sku.sku_id, sgg_id=sgg_id)
+        async def _trend():
+            # 가격 추이(최근 n주/일) — price_stats 기반
+            async with session_factory() as s:
+                return await crud.get_price_trend(s, sku_id=sku_id, region_id=region_id, weeks=8)
 
-        # 5) 가격 추이(최근 n주/일) — price_stats 기반
-        price_trend = await crud.get_price_trend(db, sku_id=sku.sku_id, region_id=region_id, weeks=8)
+        async def _lowest():
+            # 최저가 매물 N개(출처/링크 포함)
+            async with session_factory() as s:
+                return await crud.get_lowest_price_listings(s, sku_id=sku_id, sgg_id=sgg_id, limit=5)
 
-        # 6) 최저가 매물 N개(출처/링크 포함)
-        lowest_listings = await crud.get_lowest_price_listings(
-            db, sku_id=sku.sku_id, sgg_id=sgg_id, limit=5
+        summary, regional_analysis, price_trend, lowest_listings = await asyncio.gather(
+            _summary(), _regional(), _trend(), _lowest()
         )
 
         return ProductPriceResponse(
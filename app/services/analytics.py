@@ -1,10 +1,23 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, List
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import bindparam, text
 from fastapi import HTTPException
+from app.core.cache import TTLCache
+from app.db.session import SessionLocal
 
 PRODUCT2CATEGORY = {"iPhone":1, "iPad":2, "MacBook":3, "AppleWatch":4, "AirPods":5}
 
+# option_id / region_id 는 거의 바뀌지 않는 참조 데이터라 프로세스 안에서 재사용
+# 찾지 못한(None) 결과는 나중에 생길 수 있어 캐시하지 않음
+LOOKUP_CACHE_TTL = 3600  # 초
+_lookup_cache = TTLCache(LOOKUP_CACHE_TTL)
+
+def invalidate_lookup_cache() -> None:
+    """attribute_options / 지역 테이블이 바뀐 뒤 호출"""
+    _lookup_cache.clear()
+
 def rows_to_dicts(rows):
     return [dict(r) for r in rows]
 
@@ -38,7 +51,39 @@ async def fetch_sku_id_with_fingerprint(session: AsyncSession, product: str, spe
     
     # spec을 알파벳 순서로 정렬
     sorted_spec = sorted(spec.items(), key=lambda x: x[0])
-    
+
+    # storage 외 필드의 option_id를 한 번의 쿼리로 조회 (필드마다 왕복하던 N+1 제거)
+    pairs = {
+        (key.lower(), str(value).lower())
+        for key, value in sorted_spec
+        if value and key in supported_fields and key.lower() != "storage"
+    }
+    option_ids: Dict[tuple, int] = {}
+    missing = []
+    for pair in pairs:
+        option_id = _lookup_cache.get(("option",) + pair)
+        if option_id is None:
+            missing.append(pair)
+        else:
+            option_ids[pair] = option_id
+    if missing:
+        pair_params: Dict[str, Any] = {}
+        pair_conds = []
+        for i, (code, val) in enumerate(missing):
+            pair_conds.append(f"(LOWER(a.code) = :c{i} AND LOWER(ao.value) = :v{i})")
+            pair_params[f"c{i}"] = code
+            pair_params[f"v{i}"] = val
+        query = text(f"""
+            SELECT LOWER(a.code), LOWER(ao.value), ao.option_id
+            FROM attributes a
+            JOIN attribute_options ao ON ao.attribute_id = a.attribute_id
+            WHERE {" OR ".join(pair_conds)}
+        """)
+        for code, val, option_id in (await session.execute(query, pair_params)).all():
+            if (code, val) not in option_ids:
+                option_ids[(code, val)] = option_id
+                _lookup_cache.put(("option", code, val), option_id)
+
     for idx, (key, value) in enumerate(sorted_spec):
         # null이거나 빈 값이면 스킵
         if not value or key not in supported_fields:
@@ -56,22 +101,11 @@ async def fetch_sku_id_with_fingerprint(session: AsyncSession, product: str, spe
             fingerprint_conditions.append(f"fingerprint LIKE :storage_{idx}")
             params[param_key] = f"%storage=i:{sval}%"
         
-        # 나머지는 option_id를 DB에서 조회
+        # 나머지는 위에서 조회한 option_id 사용
         else:
-            # option_id 조회
-            query = text("""
-                SELECT ao.option_id
-                FROM attributes a
-                JOIN attribute_options ao ON ao.attribute_id = a.attribute_id
-                WHERE LOWER(a.code) = :code
-                  AND LOWER(ao.value) = :value
-                LIMIT 1
-            """)
-            result = await session.execute(query, {"code": code, "value": str(value).lower()})
-            row = result.first()
+            option_id = option_ids.get((code, str(value).lower()))
             
-            if row:
-                option_id = row[0]
+            if option_id is not None:
                 param_key = f"opt_{idx}"
                 fingerprint_conditions.append(f"fingerprint LIKE :{param_key}")
                 params[param_key] = f"%{code}=o:{option_id}%"
@@ -123,6 +157,11 @@ async def fetch_region_id(session: AsyncSession, region: dict) -> int:
         sgg_cond = "AND LOWER(sgg.name) = :sgg"
         params["sgg"] = region["sgg"].lower()
 
+    cache_key = ("region", params.get("sd"), params.get("sgg"), params["emd"])
+    region_id = _lookup_cache.get(cache_key)
+    if region_id is not None:
+        return region_id
+
     q = text(f"""
         SELECT emd.region_id
         FROM emd
@@ -138,8 +177,76 @@ async def fetch_region_id(session: AsyncSession, region: dict) -> int:
         raise ValueError("Region not found with given sd/sgg/emd")
     
     print(f"Resolved region_id: {row[0]}")
+    _lookup_cache.put(cache_key, int(row[0]))
     return int(row[0])
 
+# (sku, region)별 최신 버킷은 SKU/통계 갱신 잡이 price_stats_latest에 미리 반영해 둠
+# → price_stats를 매 요청 스캔하지 않고 PK(sku_id, region_id) 범위 조회로 끝남
+# 아직 갱신 전이라 price_stats_latest에 행이 없으면 price_stats에서 같은 행을 직접 골라 다시 조회
+_STATS_LATEST = "price_stats_latest"
+_STATS_FROM_PRICE_STATS = """(
+        SELECT t.sku_id, t.region_id, t.bucket_ts, t.items_num, t.avg_price, t.min_price, t.max_price
+        FROM (
+            SELECT p.sku_id, p.region_id, p.bucket_ts, p.items_num, p.avg_price, p.min_price, p.max_price,
+                   ROW_NUMBER() OVER (PARTITION BY p.sku_id, p.region_id ORDER BY p.bucket_ts DESC) AS rn
+            FROM price_stats p
+            WHERE p.sku_id IN :sku_ids
+        ) AS t
+        WHERE t.rn = 1
+    )"""
+
+def _stats_queries(sql: str, **fmt):
+    """{stats} 자리에 price_stats_latest / price_stats 파생 테이블을 넣은 (기본, 폴백) 쿼리 쌍"""
+    return tuple(
+        text(sql.format(stats=stats, **fmt)).bindparams(bindparam("sku_ids", expanding=True))
+        for stats in (_STATS_LATEST, _STATS_FROM_PRICE_STATS)
+    )
+
+async def _latest_rows(session: AsyncSession, queries, params: Dict[str, Any]):
+    q, q_fallback = queries
+    rows = (await session.execute(q, params)).mappings().all()
+    if not rows:
+        rows = (await session.execute(q_fallback, params)).mappings().all()
+    return rows
+
+_Q_SUMMARY_SEOUL = _stats_queries("""
+    SELECT
+        SUM(ps.avg_price * ps.items_num) * 1.0 / NULLIF(SUM(ps.items_num), 0) AS avg_price,
+        MAX(ps.max_price) AS max_price,
+        MIN(ps.min_price) AS min_price,
+        SUM(ps.items_num) AS cnt,
+        MAX(ps.bucket_ts) AS data_date
+    FROM {stats} ps
+    WHERE ps.sku_id IN :sku_ids
+      AND EXISTS (
+          SELECT 1
+          FROM emd
+          JOIN sgg ON emd.sgg_id = sgg.sgg_id
+          JOIN sd  ON sgg.sd_id  = sd.sd_id
+          WHERE emd.region_id = ps.region_id
+            AND LOWER(sd.name) = :sd_name
+      )
+    """)
+
+_Q_SUMMARY_REGION = _stats_queries("""
+    SELECT
+        -- 가중 평균: SUM(avg_price * items_num) / SUM(items_num)
+        COALESCE(
+            CAST(
+                SUM(ps.avg_price * ps.items_num) * 1.0 / NULLIF(SUM(ps.items_num), 0)
+                AS INTEGER
+            ), 
+            0
+        ) AS avg_price,
+        COALESCE(MAX(ps.max_price), 0) AS max_price,
+        COALESCE(MIN(ps.min_price), 0) AS min_price,
+        COALESCE(SUM(ps.items_num), 0) AS cnt,
+        COALESCE(MAX(ps.bucket_ts), '') AS data_date
+    FROM {stats} ps
+    WHERE ps.sku_id IN :sku_ids
+    AND ps.region_id = :region_id
+    """)
+
 async def fetch_summary_info(session: AsyncSession, sku_ids: List[int], region_id: int | None, model_name: str) -> Dict[str, Any]:
     if not sku_ids:
         return {
@@ -151,72 +258,22 @@ async def fetch_summary_info(session: AsyncSession, sku_ids: List[int], region_i
             "data_date": ""
         }
     
-    # sku_ids를 IN 절로 처리
-    placeholders = ",".join([f":sku_{i}" for i in range(len(sku_ids))])
-    params: Dict[str, Any] = {f"sku_{i}": sku_id for i, sku_id in enumerate(sku_ids)}
+    # sku_ids는 expanding 바인딩으로 IN 절에 펼침
+    params: Dict[str, Any] = {"sku_ids": list(sku_ids)}
 
     if region_id is None:
         params["sd_name"] = "서울특별시"
 
-        q = text(f"""
-        WITH latest AS (
-            SELECT ps.sku_id, ps.region_id, MAX(ps.bucket_ts) AS bucket_ts
-            FROM price_stats ps
-            WHERE ps.sku_id IN ({placeholders})
-              AND EXISTS (
-                  SELECT 1
-                  FROM emd
-                  JOIN sgg ON emd.sgg_id = sgg.sgg_id
-                  JOIN sd  ON sgg.sd_id  = sd.sd_id
-                  WHERE emd.region_id = ps.region_id
-                    AND LOWER(sd.name) = :sd_name
-              )
-            GROUP BY ps.sku_id, ps.region_id
-        )
-        SELECT
-            SUM(ps.avg_price * ps.items_num) * 1.0 / NULLIF(SUM(ps.items_num), 0) AS avg_price,
-            MAX(ps.max_price) AS max_price,
-            MIN(ps.min_price) AS min_price,
-            SUM(ps.items_num) AS cnt,
-            MAX(ps.bucket_ts) AS data_date
-        FROM price_stats ps
-        JOIN latest l
-          ON ps.sku_id = l.sku_id
-         AND ps.region_id = l.region_id
-         AND ps.bucket_ts = l.bucket_ts
-        """)
+        q = _Q_SUMMARY_SEOUL
     else:
         params["region_id"] = region_id
 
-        q = text(f"""
-        WITH latest AS (
-            SELECT ps.sku_id, ps.region_id, MAX(ps.bucket_ts) AS bucket_ts
-            FROM price_stats ps
-            WHERE ps.sku_id IN ({placeholders})
-            AND ps.region_id = :region_id
-            GROUP BY ps.sku_id, ps.region_id
-        )
-        SELECT
-            -- 가중 평균: SUM(avg_price * items_num) / SUM(items_num)
-            COALESCE(
-                CAST(
-                    SUM(ps.avg_price * ps.items_num) * 1.0 / NULLIF(SUM(ps.items_num), 0)
-                    AS INTEGER
-                ), 
-                0
-            ) AS avg_price,
-            COALESCE(MAX(ps.max_price), 0) AS max_price,
-            COALESCE(MIN(ps.min_price), 0) AS min_price,
-            COALESCE(SUM(ps.items_num), 0) AS cnt,
-            COALESCE(MAX(ps.bucket_ts), '') AS data_date
-        FROM price_stats ps
-        JOIN latest l
-        ON ps.sku_id = l.sku_id
-        AND ps.region_id = l.region_id
-        AND ps.bucket_ts = l.bucket_ts
-        """)
+        q = _Q_SUMMARY_REGION
     
-    row = (await session.execute(q, params)).first()
+    # 집계 쿼리라 항상 1행 - 최신 버킷 날짜(data_date)가 비어 있으면 price_stats로 폴백
+    row = (await session.execute(q[0], params)).first()
+    if not row or not row[4]:
+        row = (await session.execute(q[1], params)).first()
     
     if not row or all(v is None for v in row):
         # 데이터가 전혀 없을 때 404 반환
@@ -239,6 +296,119 @@ async def fetch_summary_info(session: AsyncSession, sku_ids: List[int], region_i
         "data_date": data_date or ""
     }
 
+# 서울특별시 전체 기준, 최신 버킷의 읍면동별 집계.
+# 지역분석 행(sgg/emd/average_price/listing_count)에 더해
+# 요약 계산용 합계/최고/최저/날짜 컬럼도 같이 돌려준다.
+_Q_REGIONAL_SEOUL = _stats_queries("""
+    -- 1) 서울특별시에 해당하는 모든 region_id 찾기
+    WITH seoul_regions AS (
+        SELECT emd.region_id
+        FROM emd
+        JOIN sgg ON emd.sgg_id = sgg.sgg_id
+        JOIN sd  ON sgg.sd_id = sd.sd_id
+        WHERE LOWER(sd.name) = :sd_name
+    ),
+
+    -- 2) price_stats_latest(최신 버킷)의 지역별 price stats 집계
+    regional AS (
+        SELECT
+            ps.region_id,
+            SUM(ps.avg_price * ps.items_num) AS weighted_sum,
+            SUM(ps.items_num) AS total_items,
+            SUM(ps.items_num) AS listing_count,
+            MAX(ps.bucket_ts) AS data_date,
+            MAX(ps.max_price) AS highest_listing_price,
+            MIN(ps.min_price) AS lowest_listing_price
+        FROM {stats} ps
+        WHERE ps.sku_id IN :sku_ids
+        AND ps.region_id IN (SELECT region_id FROM seoul_regions)
+        GROUP BY ps.region_id
+    )
+
+    -- 3) emd, sgg 이름을 붙여서 반환 형식에 맞추기
+    SELECT
+        -- 응답 필드 이름/타입 그대로 (파이썬에서 다시 캐스팅하지 않도록 SQL에서 정수화)
+        COALESCE(sgg.name, '') AS sgg,
+        COALESCE(emd.name, '') AS emd,
+        COALESCE(CAST(regional.weighted_sum * 1.0 / NULLIF(regional.total_items, 0) AS INTEGER), 0) AS average_price,
+        COALESCE(CAST(regional.listing_count AS INTEGER), 0) AS listing_count,
+        regional.weighted_sum AS weighted_sum,
+        regional.total_items AS total_items,
+        regional.highest_listing_price AS highest_listing_price,
+        regional.lowest_listing_price AS lowest_listing_price,
+        regional.data_date AS data_date
+    FROM regional
+    JOIN emd ON regional.region_id = emd.region_id
+    JOIN sgg ON emd.sgg_id = sgg.sgg_id
+    ORDER BY average_price ASC;
+    """)
+
+def _seoul_regional_item(r) -> Dict[str, Any]:
+    # 요약용 합계 컬럼은 빼고 응답 필드만 (값은 SQL에서 이미 정수/문자열로 정리됨)
+    return {
+        "sgg": r["sgg"],
+        "emd": r["emd"],
+        "average_price": r["average_price"],
+        "listing_count": r["listing_count"]
+    }
+
+async def fetch_seoul_overview(session: AsyncSession, sku_ids: List[int], model_name: str) -> tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    지역 미지정(서울 전체) 요청용: 요약과 지역분석을 price_stats_latest 한 번 조회로 계산.
+    fetch_summary_info / fetch_regional_analysis 의 서울 분기와 같은 결과를 낸다.
+    """
+    if not sku_ids:
+        return await fetch_summary_info(session, sku_ids, None, model_name), []
+
+    params: Dict[str, Any] = {"sku_ids": list(sku_ids)}
+    params["sd_name"] = "서울특별시"
+
+    rows = await _latest_rows(session, _Q_REGIONAL_SEOUL, params)
+    if not rows:
+        raise HTTPException(status_code=404, detail="No price statistics found for Seoul (서울특별시).")
+
+    # 읍면동별 합계를 다시 합쳐 서울 전체 요약을 만듦 (가중 평균 = 합계 / 개수)
+    weighted_sum = sum(r["weighted_sum"] or 0 for r in rows)
+    total_items = sum(r["total_items"] or 0 for r in rows)
+    highs = [r["highest_listing_price"] for r in rows if r["highest_listing_price"] is not None]
+    lows = [r["lowest_listing_price"] for r in rows if r["lowest_listing_price"] is not None]
+    dates = [r["data_date"] for r in rows if r["data_date"] is not None]
+
+    summary = {
+        "model_name": model_name,
+        "average_price": int(float(weighted_sum) / total_items) if total_items else 0,
+        "highest_listing_price": int(max(highs)) if highs else 0,
+        "lowest_listing_price": int(min(lows)) if lows else 0,
+        "listing_count": int(total_items),
+        "data_date": max(dates) if dates else ""
+    }
+    return summary, [_seoul_regional_item(r) for r in rows]
+
+_REGIONAL_SGG_SQL = """
+    SELECT
+        sgg.name AS sgg,
+        emd.name AS emd,
+        COALESCE(
+            CAST(
+                SUM(ps.avg_price * ps.items_num) * 1.0 / NULLIF(SUM(ps.items_num), 0)
+                AS INTEGER
+            ), 
+            0
+        ) AS average_price,
+        COALESCE(SUM(ps.items_num), 0) AS listing_count
+    FROM {stats} ps
+    JOIN emd ON ps.region_id = emd.region_id
+    JOIN sgg ON emd.sgg_id = sgg.sgg_id
+    JOIN sd  ON sgg.sd_id  = sd.sd_id
+    WHERE ps.sku_id IN :sku_ids
+      AND LOWER(sgg.name) = :sgg
+      {sd_filter}
+    GROUP BY sgg.name, emd.name
+    ORDER BY average_price ASC, emd.name
+    """
+_Q_REGIONAL_SGG = _stats_queries(_REGIONAL_SGG_SQL, sd_filter="")
+_Q_REGIONAL_SGG_SD = _stats_queries(_REGIONAL_SGG_SQL, sd_filter="AND LOWER(sd.name) = :sd")
+
 async def fetch_regional_analysis(session: AsyncSession, sku_ids: List[int], region: dict) -> List[Dict[str, Any]]:
     """
     같은 시군구(sgg)에 속한 모든 읍면동(emd)에 대해
@@ -249,8 +419,7 @@ async def fetch_regional_analysis(session: AsyncSession, sku_ids: List[int], reg
     if not sku_ids:
         return []
     
-    placeholders = ",".join([f":sku_{i}" for i in range(len(sku_ids))])
-    params: Dict[str, Any] = {f"sku_{i}": sku_id for i, sku_id in enumerate(sku_ids)}
+    params: Dict[str, Any] = {"sku_ids": list(sku_ids)}
 
     if not region:
         raise ValueError("Region is required for regional analysis")
@@ -258,115 +427,94 @@ async def fetch_regional_analysis(session: AsyncSession, sku_ids: List[int], reg
     if not region.get("sgg") or not region.get("emd"):
         params["sd_name"] = "서울특별시"
 
-        q = text(f"""
-        -- 1) 서울특별시에 해당하는 모든 region_id 찾기
-        WITH seoul_regions AS (
-            SELECT emd.region_id
-            FROM emd
-            JOIN sgg ON emd.sgg_id = sgg.sgg_id
-            JOIN sd  ON sgg.sd_id = sd.sd_id
-            WHERE LOWER(sd.name) = :sd_name
-        ),
-
-        -- 2) region_id + sku_id별 최신 bucket_ts
-        latest AS (
-            SELECT ps.sku_id, ps.region_id, MAX(ps.bucket_ts) AS bucket_ts
-            FROM price_stats ps
-            WHERE ps.sku_id IN ({placeholders})
-            AND ps.region_id IN (SELECT region_id FROM seoul_regions)
-            GROUP BY ps.sku_id, ps.region_id
-        ),
-
-        -- 3) 최신 버킷에 대한 지역별 price stats 집계
-        regional AS (
-            SELECT
-                ps.region_id,
-                SUM(ps.avg_price * ps.items_num) AS weighted_sum,
-                SUM(ps.items_num) AS total_items,
-                SUM(ps.items_num) AS listing_count,
-                MAX(ps.bucket_ts) AS data_date,
-                MAX(ps.max_price) AS highest_listing_price,
-                MIN(ps.min_price) AS lowest_listing_price
-            FROM price_stats ps
-            JOIN latest l
-            ON ps.sku_id = l.sku_id
-            AND ps.region_id = l.region_id
-            AND ps.bucket_ts = l.bucket_ts
-            GROUP BY ps.region_id
-        )
-
-        -- 4) emd, sgg 이름을 붙여서 반환 형식에 맞추기
-        SELECT
-            sgg.name AS sgg_name,
-            emd.name AS emd_name,
-            CAST(regional.weighted_sum * 1.0 / NULLIF(regional.total_items, 0) AS INTEGER) AS average_price,
-            regional.listing_count AS listing_count
-        FROM regional
-        JOIN emd ON regional.region_id = emd.region_id
-        JOIN sgg ON emd.sgg_id = sgg.sgg_id
-        ORDER BY average_price ASC;
-        """)
+        q = _Q_REGIONAL_SEOUL
 
-        rows = (await session.execute(q, params)).mappings().all()
+        rows = await _latest_rows(session, q, params)
 
         if not rows:
             raise HTTPException(status_code=404, detail="No price statistics found for Seoul.")
 
         # 매핑: SQL RowMapping -> 원하는 JSON 형식
-        result = []
-        for r in rows:
-            sgg_name = r.get("sgg_name") or ""
-            emd_name = r.get("emd_name") or ""
-            avg_price = r.get("average_price")
-            listing_count = r.get("listing_count")
-
-            result.append({
-                "sgg": sgg_name,
-                "emd": emd_name,
-                "average_price": int(avg_price) if avg_price is not None else 0,
-                "listing_count": int(listing_count) if listing_count is not None else 0
-            })
-
-        return result
+        return [_seoul_regional_item(r) for r in rows]
 
     params["sgg"] = region["sgg"].lower()
     
-    sd_filter = ""
-    if region.get("sd"):
-        sd_filter = "AND LOWER(sd.name) = :sd"
+    sd_filter = bool(region.get("sd"))
+    if sd_filter:
         params["sd"] = region["sd"].lower()
 
-    q = text(f"""
-    WITH latest AS (
-        SELECT ps.sku_id, ps.region_id, MAX(ps.bucket_ts) AS bucket_ts
+    q = _Q_REGIONAL_SGG_SD if sd_filter else _Q_REGIONAL_SGG
+    rows = await _latest_rows(session, q, params)
+    return [dict(r) for r in rows]
+
+_Q_TREND_ALL = text("""
+    WITH weekly_data AS (
+        SELECT
+            -- 주차 계산: 현재 날짜 기준 몇 주 전인지 계산
+            CAST((julianday('now') - julianday(ps.bucket_ts)) / 7 AS INTEGER) AS weeks_ago,
+            ps.avg_price,
+            ps.items_num,
+            ps.bucket_ts
         FROM price_stats ps
-        WHERE ps.sku_id IN ({placeholders})
-        GROUP BY ps.sku_id, ps.region_id
+        WHERE ps.sku_id IN :sku_ids
+        -- 날짜 단위 대략 범위로 먼저 인덱스 범위 스캔 후, 실제 4주 이내 여부는 시각을 파싱해 판단
+        -- ('T' 구분자/UTC 오프셋이 붙은 값도 문자열 비교로 잘못 걸러지지 않도록)
+        AND ps.bucket_ts >= :since_date
+        AND julianday('now') - julianday(ps.bucket_ts) <= 28  -- 4주 이내
     )
     SELECT
-        sgg.name AS sgg,
-        emd.name AS emd,
+        -- 주차별로 그룹화 (0 = 이번 주, 1 = 1주 전, ...)
+        weeks_ago,
+        -- 가중 평균: SUM(avg_price * items_num) / SUM(items_num)
         COALESCE(
             CAST(
-                SUM(ps.avg_price * ps.items_num) * 1.0 / NULLIF(SUM(ps.items_num), 0)
+                SUM(avg_price * items_num) * 1.0 / NULLIF(SUM(items_num), 0)
                 AS INTEGER
-            ), 
+            ),
             0
-        ) AS average_price,
-        COALESCE(SUM(ps.items_num), 0) AS listing_count
-    FROM price_stats ps
-    JOIN latest l ON ps.sku_id = l.sku_id AND ps.region_id = l.region_id AND ps.bucket_ts = l.bucket_ts
-    JOIN emd ON ps.region_id = emd.region_id
-    JOIN sgg ON emd.sgg_id = sgg.sgg_id
-    JOIN sd  ON sgg.sd_id  = sd.sd_id
-    WHERE ps.sku_id IN ({placeholders})
-      AND LOWER(sgg.name) = :sgg
-      {sd_filter}
-    GROUP BY sgg.name, emd.name
-    ORDER BY average_price ASC, emd.name
-    """)
-    rows = (await session.execute(q, params)).mappings().all()
-    return [dict(r) for r in rows]
+        ) AS price,
+        -- 가장 최근 날짜를 period로 사용
+        MAX(bucket_ts) AS period
+    FROM weekly_data
+    GROUP BY weeks_ago
+    ORDER BY weeks_ago ASC
+    LIMIT 4
+    """).bindparams(bindparam("sku_ids", expanding=True))
+
+_Q_TREND_REGION = text("""
+    WITH weekly_data AS (
+        SELECT
+            -- 주차 계산: 현재 날짜 기준 몇 주 전인지 계산
+            CAST((julianday('now') - julianday(ps.bucket_ts)) / 7 AS INTEGER) AS weeks_ago,
+            ps.avg_price,
+            ps.items_num,
+            ps.bucket_ts
+        FROM price_stats ps
+        WHERE ps.sku_id IN :sku_ids
+        AND ps.region_id = :region_id
+        -- 날짜 단위 대략 범위로 먼저 인덱스 범위 스캔 후, 실제 4주 이내 여부는 시각을 파싱해 판단
+        -- ('T' 구분자/UTC 오프셋이 붙은 값도 문자열 비교로 잘못 걸러지지 않도록)
+        AND ps.bucket_ts >= :since_date
+        AND julianday('now') - julianday(ps.bucket_ts) <= 28  -- 4주 이내
+    )
+    SELECT
+        -- 주차별로 그룹화 (0 = 이번 주, 1 = 1주 전, ...)
+        weeks_ago,
+        -- 가중 평균: SUM(avg_price * items_num) / SUM(items_num)
+        COALESCE(
+            CAST(
+                SUM(avg_price * items_num) * 1.0 / NULLIF(SUM(items_num), 0)
+                AS INTEGER
+            ),
+            0
+        ) AS price,
+        -- 가장 최근 날짜를 period로 사용
+        MAX(bucket_ts) AS period
+    FROM weekly_data
+    GROUP BY weeks_ago
+    ORDER BY weeks_ago ASC
+    LIMIT 4
+    """).bindparams(bindparam("sku_ids", expanding=True))
 
 async def fetch_price_trend(session: AsyncSession, sku_ids: List[int], region_id: int | None) -> Dict[str, Any]:
     """
@@ -376,75 +524,18 @@ async def fetch_price_trend(session: AsyncSession, sku_ids: List[int], region_id
     if not sku_ids:
         raise HTTPException(status_code=404, detail="No SKU IDs provided")
     
-    placeholders = ",".join([f":sku_{i}" for i in range(len(sku_ids))])
-    params: Dict[str, Any] = {f"sku_{i}": sku_id for i, sku_id in enumerate(sku_ids)}
+    params: Dict[str, Any] = {"sku_ids": list(sku_ids)}
+    # 인덱스 범위용 하한 날짜: 저장값의 UTC 오프셋(최대 ±1일)을 감안해 하루 여유를 둔 'YYYY-MM-DD'
+    # (날짜 접두가 같거나 큰 문자열은 구분자/오프셋 표기와 상관없이 모두 포함됨)
+    params["since_date"] = (datetime.now(timezone.utc) - timedelta(days=29)).date().isoformat()
 
     if region_id is None:
-        q = text(f"""
-        WITH weekly_data AS (
-            SELECT
-                -- 주차 계산: 현재 날짜 기준 몇 주 전인지 계산
-                CAST((julianday('now') - julianday(ps.bucket_ts)) / 7 AS INTEGER) AS weeks_ago,
-                ps.avg_price,
-                ps.items_num,
-                ps.bucket_ts
-            FROM price_stats ps
-            WHERE ps.sku_id IN ({placeholders})
-            AND julianday('now') - julianday(ps.bucket_ts) <= 28  -- 4주 이내
-        )
-        SELECT
-            -- 주차별로 그룹화 (0 = 이번 주, 1 = 1주 전, ...)
-            weeks_ago,
-            -- 가중 평균: SUM(avg_price * items_num) / SUM(items_num)
-            COALESCE(
-                CAST(
-                    SUM(avg_price * items_num) * 1.0 / NULLIF(SUM(items_num), 0)
-                    AS INTEGER
-                ),
-                0
-            ) AS price,
-            -- 가장 최근 날짜를 period로 사용
-            MAX(bucket_ts) AS period
-        FROM weekly_data
-        GROUP BY weeks_ago
-        ORDER BY weeks_ago ASC
-        LIMIT 4
-        """)
+        q = _Q_TREND_ALL
 
     else:
         params["region_id"] = region_id
 
-        q = text(f"""
-        WITH weekly_data AS (
-            SELECT
-                -- 주차 계산: 현재 날짜 기준 몇 주 전인지 계산
-                CAST((julianday('now') - julianday(ps.bucket_ts)) / 7 AS INTEGER) AS weeks_ago,
-                ps.avg_price,
-                ps.items_num,
-                ps.bucket_ts
-            FROM price_stats ps
-            WHERE ps.sku_id IN ({placeholders})
-            AND ps.region_id = :region_id
-            AND julianday('now') - julianday(ps.bucket_ts) <= 28  -- 4주 이내
-        )
-        SELECT
-            -- 주차별로 그룹화 (0 = 이번 주, 1 = 1주 전, ...)
-            weeks_ago,
-            -- 가중 평균: SUM(avg_price * items_num) / SUM(items_num)
-            COALESCE(
-                CAST(
-                    SUM(avg_price * items_num) * 1.0 / NULLIF(SUM(items_num), 0)
-                    AS INTEGER
-                ),
-                0
-            ) AS price,
-            -- 가장 최근 날짜를 period로 사용
-            MAX(bucket_ts) AS period
-        FROM weekly_data
-        GROUP BY weeks_ago
-        ORDER BY weeks_ago ASC
-        LIMIT 4
-        """)
+        q = _Q_TREND_REGION
 
     rows = (await session.execute(q, params)).mappings().all()
     # weeks_ago 역순으로 정렬되어 있으므로 다시 reverse (오래된 것부터)
@@ -466,6 +557,50 @@ async def fetch_price_trend(session: AsyncSession, sku_ids: List[int], region_id
         "chart_data": rows
     }
 
+# 최저가 top-N을 items 인덱스만으로 먼저 자른 뒤, 남은 N건에만 emd/sgg 이름을 붙인다
+# (조인 후 정렬하면 매칭되는 모든 매물에 조인이 걸림)
+_Q_LOWEST_ALL = text("""
+    SELECT 
+        i.price AS listing_price,
+        sgg.name AS sgg,
+        emd.name AS emd,
+        i.source AS source,
+        i.url AS source_url
+    FROM (
+        SELECT price, region_id, source, url
+        FROM items
+        WHERE sku_id IN :sku_ids
+        AND status = 'active'
+        AND region_id IS NOT NULL
+        ORDER BY price ASC
+        LIMIT :limit
+    ) i
+    JOIN emd ON i.region_id = emd.region_id
+    JOIN sgg ON emd.sgg_id = sgg.sgg_id
+    ORDER BY i.price ASC
+    """).bindparams(bindparam("sku_ids", expanding=True))
+
+_Q_LOWEST_REGION = text("""
+    SELECT 
+        i.price AS listing_price,
+        sgg.name AS sgg,
+        emd.name AS emd,
+        i.source AS source,
+        i.url AS source_url
+    FROM (
+        SELECT price, region_id, source, url
+        FROM items
+        WHERE sku_id IN :sku_ids
+        AND status = 'active'
+        AND region_id = :region_id
+        ORDER BY price ASC
+        LIMIT :limit
+    ) i
+    JOIN emd ON i.region_id = emd.region_id
+    JOIN sgg ON emd.sgg_id = sgg.sgg_id
+    ORDER BY i.price ASC
+    """).bindparams(bindparam("sku_ids", expanding=True))
+
 async def fetch_lowest_listings(session: AsyncSession, sku_ids: List[int], region_id: int, limit: int = 70) -> List[Dict[str, Any]]:
     """
     해당 region_id와 sku_ids에 해당하는 items 중 가격이 낮은 순으로 반환.
@@ -474,57 +609,50 @@ async def fetch_lowest_listings(session: AsyncSession, sku_ids: List[int], regio
     if not sku_ids:
         return []
     
-    placeholders = ",".join([f":sku_{i}" for i in range(len(sku_ids))])
-    params: Dict[str, Any] = {f"sku_{i}": sku_id for i, sku_id in enumerate(sku_ids)}
+    params: Dict[str, Any] = {"sku_ids": list(sku_ids)}
     params["limit"] = limit
 
     if not region_id:
-        q = text(f"""
-        SELECT 
-            i.price AS listing_price,
-            sgg.name AS sgg,
-            emd.name AS emd,
-            i.source AS source,
-            i.url AS source_url
-        FROM items i
-        JOIN emd ON i.region_id = emd.region_id
-        JOIN sgg ON emd.sgg_id = sgg.sgg_id
-        WHERE i.sku_id IN ({placeholders})
-        AND i.status = 'active'
-        ORDER BY i.price ASC
-        LIMIT :limit
-        """)
+        q = _Q_LOWEST_ALL
 
     else:
         params["region_id"] = region_id
-        q = text(f"""
-        SELECT 
-            i.price AS listing_price,
-            sgg.name AS sgg,
-            emd.name AS emd,
-            i.source AS source,
-            i.url AS source_url
-        FROM items i
-        JOIN emd ON i.region_id = emd.region_id
-        JOIN sgg ON emd.sgg_id = sgg.sgg_id
-        WHERE i.sku_id IN ({placeholders})
-        AND i.region_id = :region_id
-        AND i.status = 'active'
-        ORDER BY i.price ASC
-        LIMIT :limit
-        """)
+        q = _Q_LOWEST_REGION
     
     rows = (await session.execute(q, params)).mappings().all()
     return [dict(r) for r in rows]
 
-async def run_analytics(session: AsyncSession, product: str, spec: dict, region: dict) -> Dict[str, Any]:
+async def _in_own_session(session_factory: async_sessionmaker[AsyncSession], fetch, *args, **kwargs):
+    async with session_factory() as s:
+        return await fetch(s, *args, **kwargs)
+
+async def run_analytics(
+    session: AsyncSession,
+    product: str,
+    spec: dict,
+    region: dict,
+    session_factory: async_sessionmaker[AsyncSession] = SessionLocal,
+) -> Dict[str, Any]:
     
     sku_ids, model_name = await fetch_sku_id_with_fingerprint(session, product, spec)
     region_id = await fetch_region_id(session, region)
-    summary = await fetch_summary_info(session, sku_ids, region_id, model_name)
-    regional = await fetch_regional_analysis(session, sku_ids,  region)
-    trend   = await fetch_price_trend(session, sku_ids, region_id)
-    lowest  = await fetch_lowest_listings(session, sku_ids, region_id, limit=70)
+    # The reads below are independent; run them concurrently.
+    # An AsyncSession can't be shared across concurrent tasks, so each gets its own.
+    if region_id is None:
+        # No emd given: summary and regional both cover all of Seoul and read the
+        # same price_stats_latest rows, so compute them from one query.
+        (summary, regional), trend, lowest = await asyncio.gather(
+            _in_own_session(session_factory, fetch_seoul_overview, sku_ids, model_name),
+            _in_own_session(session_factory, fetch_price_trend, sku_ids, region_id),
+            _in_own_session(session_factory, fetch_lowest_listings, sku_ids, region_id, limit=70),
+        )
+    else:
+        summary, regional, trend, lowest = await asyncio.gather(
+            _in_own_session(session_factory, fetch_summary_info, sku_ids, region_id, model_name),
+            _in_own_session(session_factory, fetch_regional_analysis, sku_ids, region),
+            _in_own_session(session_factory, fetch_price_trend, sku_ids, region_id),
+            _in_own_session(session_factory, fetch_lowest_listings, sku_ids, region_id, limit=70),
+        )
 
     return {
         "status": "success",
@@ -1,22 +1,34 @@
-from typing import Sequence
+import re
+from typing import Dict, Iterable, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from app.schemas.items import RawItem
 
+# 가격 문자열 파싱용 테이블/패턴은 모듈 로드 시 한 번만 만든다
+_PRICE_STRIP = str.maketrans("", "", ", 원")
+_PRICE_SKIP_RE = re.compile("나눔|무료|가격|문의")
+_NON_DIGIT_RE = re.compile(r"\D+")
+
 def parse_price_to_int(price_text: str | None) -> int | None:
     if not price_text: return None
-    t = price_text.replace(",", "").replace("원","").replace(" ", "")
-    if any(k in t for k in ["나눔","무료","가격","문의"]): return None
-    digits = "".join(ch for ch in t if ch.isdigit())
+    t = price_text.translate(_PRICE_STRIP)
+    if _PRICE_SKIP_RE.search(t): return None
+    digits = _NON_DIGIT_RE.sub("", t)
     return int(digits) if digits else None
 
-async def find_region_id(session: AsyncSession, gu: str|None, dong: str|None) -> int | None:
-    if dong:
-        q = text("SELECT region_id FROM emd WHERE name=:n LIMIT 1")
-        r = await session.execute(q, {"n": dong})
-        row = r.first()
-        if row: return row[0]
-    return None
+_REGION_IDS_SQL = text("SELECT name, region_id FROM emd WHERE name IN :names").bindparams(
+    bindparam("names", expanding=True)
+)
+
+async def find_region_ids(session: AsyncSession, emds: Iterable[str | None]) -> Dict[str, int]:
+    # 배치 안의 읍면동 이름을 한 번에 조회 (행마다 region_id를 조회하던 N+1 제거)
+    names = {e for e in emds if e}
+    if not names:
+        return {}
+    region_ids: Dict[str, int] = {}
+    for name, region_id in (await session.execute(_REGION_IDS_SQL, {"names": list(names)})).all():
+        region_ids.setdefault(name, region_id)
+    return region_ids
 
 async def upsert_items(session: AsyncSession, rows: Sequence[RawItem], default_category_id: int) -> int:
     sql = text("""
@@ -28,15 +40,14 @@ async def upsert_items(session: AsyncSession, rows: Sequence[RawItem], default_c
       price = COALESCE(EXCLUDED.price, items.price),
       updated_at = NOW()
     """)
+    region_ids = await find_region_ids(session, (r.emd for r in rows))
     n = 0
     for r in rows:
-        price = r.price if r.price is not None else parse_price_to_int(r.price_text)
-        region_id = await find_region_id(session, r.gu, r.dong)
         await session.execute(sql, {
-            "region_id": region_id,
+            "region_id": region_ids.get(r.emd) if r.emd else None,
             "category_id": r.category_id or default_category_id,
             "title": r.title or "",
-            "price": price or 0,
+            "price": r.price,
             "url": str(r.url),
             "source": r.source.value,
             "external_id": r.external_id,
@@ -2,15 +2,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Optional, Iterable, Tuple
-import hashlib
+from typing import Dict, List, Optional, Iterable, Tuple
 import re
 import logging
 
 from sqlalchemy import select, update, text, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.fingerprint import spec_fingerprint
 from app.core.logging import get_logger
+from app.db.crud import invalidate_sku_cache
 from app.db.models import (
     Item, ItemStatus,
     ItemAttributeValue, Attribute, AttributeDataType,
@@ -24,22 +25,8 @@ logger: logging.Logger = get_logger(__name__)
 # Helpers
 # ------------------------------------------------------------------------------
 
-def _fingerprint_from_specs(specs: Dict[str, str]) -> str:
-    """
-    사전형 스펙에서 SKU 식별용 fingerprint 생성.
-
-    - 키/값을 정렬하여 "k:v|k2:v2|..." 형태로 합친 후 sha256 32자.
-    - 같은 스펙이면 항상 같은 fingerprint가 나옴.
-
-    Args:
-        specs: {'model_series':'iPhone 13','color':'Blue','capacity_gb':'256', ...}
-
-    Returns:
-        32자리 해시 문자열
-    """
-    pairs = [f"{k}:{v}" for k, v in sorted(specs.items())]
-    joined = "|".join(pairs)
-    return hashlib.sha256(joined.encode("utf-8")).hexdigest()[:32]
+# IN (...) 한 번에 바인딩할 최대 id 수 (SQLite 변수 제한 / asyncpg 32767 파라미터 제한 아래로)
+IN_CHUNK_SIZE = 900
 
 
 _num_unit = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*(tb|gb)?\s*$', re.I)
@@ -69,102 +56,127 @@ def _normalize_numeric_str(val: str) -> Optional[int]:
 # Stage 1) SKU 생성/갱신 + items.sku_id 업데이트
 # ------------------------------------------------------------------------------
 
-async def _load_item_specs(session: AsyncSession, item_id: int) -> Dict[str, str]:
+def _iav_to_str(iav: ItemAttributeValue, attr: Attribute) -> Optional[str]:
+    """
+    EAV 값 1개를 Attribute.datatype 에 맞춰 문자열로 통일.
+
+    - 텍스트/정수/소수/불리언/옵션을 문자열로 변환.
+    - 용량 계열 코드는 수치 정규화(예: '256GB' → '256') 적용.
     """
-    단일 item의 EAV 속성을 읽어, 'attribute.code'를 키로, 문자열화된 값을 값으로 하는 dict 반환.
+    code = attr.code  # 예: 'model_series', 'color', 'capacity_gb'
+    dt: AttributeDataType = attr.datatype
+
+    val_str: Optional[str] = None
+    if dt == AttributeDataType.text and iav.value_text is not None:
+        val_str = str(iav.value_text).strip()
+    elif dt == AttributeDataType.int and iav.value_int is not None:
+        val_str = str(iav.value_int)
+    elif dt == AttributeDataType.decimal and iav.value_decimal is not None:
+        # 소수도 문자열로 고정 (fingerprint 안정성)
+        val_str = f"{iav.value_decimal}".rstrip("0").rstrip(".")
+    elif dt == AttributeDataType.bool and iav.value_bool is not None:
+        val_str = "1" if iav.value_bool else "0"
+    else:
+        # enum/option 형식은 value_text로 들어왔을 것으로 가정.
+        # 필요시 attribute_options 조인으로 label 값 가져와도 됨.
+        if iav.value_text is not None:
+            val_str = str(iav.value_text).strip()
+
+    # 예: 용량 정규화 ('256GB' → '256')
+    if code in {"capacity", "capacity_gb", "storage_gb"} and val_str:
+        n = _normalize_numeric_str(val_str)
+        if n is not None:
+            val_str = str(n)
 
-    - Attribute.datatype 에 따라 텍스트/정수/소수/불리언/옵션을 문자열로 통일.
-    - 필요 시 수치 정규화(예: '256GB' → '256')를 추가로 적용할 수 있음.
+    return val_str
+
+
+async def _load_specs_bulk(session: AsyncSession, item_ids: List[int]) -> Dict[int, Dict[str, str]]:
+    """
+    여러 item의 EAV 속성을 IN_CHUNK_SIZE개씩 묶은 쿼리로 읽어 item_id별 스펙 dict로 묶는다.
 
     Returns:
-        {'model_series':'iPhone 13','color':'Blue','capacity_gb':'256', ...}
+        {item_id: {'model_series':'iPhone 13','color':'Blue','capacity_gb':'256', ...}, ...}
     """
-    q = (
-        select(ItemAttributeValue, Attribute)
-        .join(Attribute, Attribute.attribute_id == ItemAttributeValue.attribute_id)
-        .where(ItemAttributeValue.item_id == item_id)
-    )
-    rows = (await session.execute(q)).all()
+    specs_by_item: Dict[int, Dict[str, str]] = {}
+    for start in range(0, len(item_ids), IN_CHUNK_SIZE):
+        q = (
+            select(ItemAttributeValue, Attribute)
+            .join(Attribute, Attribute.attribute_id == ItemAttributeValue.attribute_id)
+            .where(ItemAttributeValue.item_id.in_(item_ids[start:start + IN_CHUNK_SIZE]))
+        )
+        for iav, attr in (await session.execute(q)).all():
+            val_str = _iav_to_str(iav, attr)
+            if attr.code and val_str:
+                specs_by_item.setdefault(iav.item_id, {})[attr.code] = val_str
 
-    specs: Dict[str, str] = {}
-    for iav, attr in rows:
-        code = attr.code  # 예: 'model_series', 'color', 'capacity_gb'
-        dt: AttributeDataType = attr.datatype
+    return specs_by_item
 
-        val_str: Optional[str] = None
-        if dt == AttributeDataType.text and iav.value_text is not None:
-            val_str = str(iav.value_text).strip()
-        elif dt == AttributeDataType.int and iav.value_int is not None:
-            val_str = str(iav.value_int)
-        elif dt == AttributeDataType.decimal and iav.value_decimal is not None:
-            # 소수도 문자열로 고정 (fingerprint 안정성)
-            val_str = f"{iav.value_decimal}".rstrip("0").rstrip(".")
-        elif dt == AttributeDataType.bool and iav.value_bool is not None:
-            val_str = "1" if iav.value_bool else "0"
-        else:
-            # enum/option 형식은 value_text로 들어왔을 것으로 가정.
-            # 필요시 attribute_options 조인으로 label 값 가져와도 됨.
-            if iav.value_text is not None:
-                val_str = str(iav.value_text).strip()
-
-        # 예: 용량 정규화 ('256GB' → '256')
-        if code in {"capacity", "capacity_gb", "storage_gb"} and val_str:
-            n = _normalize_numeric_str(val_str)
-            if n is not None:
-                val_str = str(n)
-
-        if code and val_str:
-            specs[code] = val_str
-
-    return specs
-
-
-async def _ensure_sku(session: AsyncSession, category_id: int, specs: Dict[str, str]) -> Tuple[int, bool]:
+
+async def _ensure_skus_bulk(
+    session: AsyncSession,
+    category_id: int,
+    by_fp: Dict[str, Dict[str, str]],
+) -> Dict[str, int]:
     """
-    카테고리 + 스펙(fingerprint)으로 SKU를 조회/생성.
+    카테고리 + {fingerprint: 스펙} 묶음으로 SKU를 한꺼번에 조회/생성.
 
-    - 존재하면 sku_id 반환
-    - 없으면 생성 + 관련 SkuAttribute(표준화된 값) 일부 저장
+    - 호출 측에서 계산한 fingerprint로 IN 조회 1번에 기존 SKU 확인
+    - 없는 것만 add_all + flush 1번으로 생성 (SQLAlchemy 2.0 insertmanyvalues → INSERT .. RETURNING 배치)
+    - Attribute.code → attribute_id 는 한 번만 읽어 재사용
 
     Returns:
-        (sku_id, created)  created=True면 신규 생성
+        {fingerprint: sku_id}
     """
-    fp = _fingerprint_from_specs(specs)
+    fps = list(by_fp)
+
+    # 1) 기존 SKU 조회 (IN 절로 1회)
+    q = select(Sku.fingerprint, Sku.sku_id).where(
+        and_(Sku.category_id == category_id, Sku.fingerprint.in_(fps))
+    )
+    sku_ids: Dict[str, int] = dict((await session.execute(q)).all())
 
-    # 1) 기존 SKU 조회
-    q = select(Sku).where(and_(Sku.category_id == category_id, Sku.fingerprint == fp))
-    sku = (await session.execute(q)).scalar_one_or_none()
-    if sku:
-        return sku.sku_id, False
+    missing = [fp for fp in fps if fp not in sku_ids]
+    if not missing:
+        return sku_ids
 
-    # 2) 신규 생성
-    sku = Sku(category_id=category_id, fingerprint=fp)
-    session.add(sku)
-    await session.flush()  # sku_id 확보
+    # 2) 신규 생성 (flush 1회로 sku_id 확보)
+    new_skus: Dict[str, Sku] = {}
+    for fp in missing:
+        new_skus[fp] = Sku(category_id=category_id, fingerprint=fp)
+    session.add_all(new_skus.values())
+    await session.flush()
 
     # 3) (선택) 대표 속성들을 sku_attribute에 저장해 표시/검색에 활용
     #    - 저장 정책은 팀 규칙에 맞게 조정(모든 속성 vs 일부만)
-    saved_count = 0
-    for code, val in specs.items():
-        # Attribute.code 로 ID 찾아 매핑
-        a = (
-            await session.execute(
-                select(Attribute).where(Attribute.code == code)
-            )
-        ).scalar_one_or_none()
-        if not a:
-            continue
-
-        sa = SkuAttribute(
-            sku_id=sku.sku_id,
-            attribute_id=a.attribute_id,
-            value_text=val,  # 간단히 텍스트로 보관(정렬 필요하면 타입 나눠서 저장)
-        )
-        session.add(sa)
-        saved_count += 1
+    codes = {code for fp in missing for code in by_fp[fp]}
+    attr_ids: Dict[str, int] = dict(
+        (await session.execute(
+            select(Attribute.code, Attribute.attribute_id).where(Attribute.code.in_(codes))
+        )).all()
+    )
 
-    logger.debug("Created SKU %s (category=%s, attrs=%d)", sku.sku_id, category_id, saved_count)
-    return sku.sku_id, True
+    sku_attrs: List[SkuAttribute] = []
+    for fp, sku in new_skus.items():
+        name_parts: List[Tuple[str, str]] = []
+        for code, val in by_fp[fp].items():
+            attribute_id = attr_ids.get(code)
+            if attribute_id is None:
+                continue
+            sku_attrs.append(SkuAttribute(
+                sku_id=sku.sku_id,
+                attribute_id=attribute_id,
+                value_text=val,  # 간단히 텍스트로 보관(정렬 필요하면 타입 나눠서 저장)
+            ))
+            name_parts.append((code, val))
+
+        # 표시용 모델명을 미리 만들어 둠 (crud와 같은 규칙: Attribute.code 순으로 값 연결)
+        sku.display_name = " ".join(v for _, v in sorted(name_parts))[:255] or None
+        sku_ids[fp] = sku.sku_id
+    session.add_all(sku_attrs)
+
+    logger.debug("Created %d SKUs (category=%s, attrs=%d)", len(new_skus), category_id, len(sku_attrs))
+    return sku_ids
 
 
 async def ensure_sku_for_items(session: AsyncSession, limit: Optional[int] = None) -> int:
@@ -172,7 +184,7 @@ async def ensure_sku_for_items(session: AsyncSession, limit: Optional[int] = Non
     items의 속성(EAV)을 묶어 SKU를 생성/갱신하고, items.sku_id를 채운다.
 
     - 대상: sku_id 가 NULL 인 아이템(또는 limit가 있으면 상위 N개)
-    - 스펙 → fingerprint → SKU upsert → items.sku_id 업데이트
+    - 스펙 일괄 조회 → fingerprint → 카테고리별 SKU 일괄 upsert → items.sku_id 일괄 업데이트
 
     Args:
         session: AsyncSession
@@ -190,21 +202,27 @@ async def ensure_sku_for_items(session: AsyncSession, limit: Optional[int] = Non
         logger.info("SKU 대상 item 없음 (sku_id IS NULL).")
         return 0
 
-    updated = 0
-    for item_id, category_id in rows:
-        specs = await _load_item_specs(session, item_id)
-        if not specs:
-            # 속성이 하나도 없으면 SKU를 만들지 않음
-            continue
-
-        sku_id, created = await _ensure_sku(session, category_id, specs)
-
-        # items.sku_id 업데이트
-        await session.execute(
-            update(Item).where(Item.item_id == item_id).values(sku_id=sku_id)
-        )
-        updated += 1
+    specs_by_item = await _load_specs_bulk(session, [item_id for item_id, _ in rows])
 
+    # 카테고리별로 모아서 SKU 조회/생성 (속성이 하나도 없으면 SKU를 만들지 않음)
+    by_category: Dict[int, List[Tuple[int, str, Dict[str, str]]]] = {}
+    for item_id, category_id in rows:
+        specs = specs_by_item.get(item_id)
+        if specs:
+            fp = spec_fingerprint(specs)
+            by_category.setdefault(category_id, []).append((item_id, fp, specs))
+
+    params: List[Dict[str, int]] = []
+    for category_id, triples in by_category.items():
+        by_fp = {fp: specs for _, fp, specs in triples}
+        sku_ids = await _ensure_skus_bulk(session, category_id, by_fp)
+        params.extend({"item_id": item_id, "sku_id": sku_ids[fp]} for item_id, fp, _ in triples)
+
+    # items.sku_id 업데이트 (PK 기준 executemany 1회)
+    if params:
+        await session.execute(update(Item), params)
+
+    updated = len(params)
     logger.info("SKU 매핑 완료: %d개 items 갱신", updated)
     return updated
 
@@ -285,6 +303,42 @@ async def refresh_price_stats(session: AsyncSession, options: StatsOptions = Sta
     return res.rowcount if res.rowcount is not None else 0
 
 
+async def refresh_price_stats_latest(session: AsyncSession) -> int:
+    """
+    price_stats에서 (sku_id, region_id)별 가장 최근 버킷 1행을 price_stats_latest에 업서트.
+
+    - 요약/지역분석 조회가 ORDER BY bucket_ts DESC LIMIT 1 대신 PK 조회로 끝나도록
+    - 더 오래된 버킷이 최신 행을 덮어쓰지 않도록 bucket_ts 비교 후 갱신
+    - DISTINCT ON 대신 ROW_NUMBER()를 써서 Postgres/SQLite(3.25+) 모두에서 동작
+
+    Returns:
+        upsert된 행 개수(추정)
+    """
+    # SQLite는 INSERT ... SELECT 뒤의 ON CONFLICT를 JOIN 구문과 구분하려고 SELECT에 WHERE가 있어야 함
+    sql = text("""
+        INSERT INTO price_stats_latest (sku_id, region_id, bucket_ts, items_num, avg_price, min_price, max_price)
+        SELECT t.sku_id, t.region_id, t.bucket_ts, t.items_num, t.avg_price, t.min_price, t.max_price
+        FROM (
+            SELECT ps.sku_id, ps.region_id, ps.bucket_ts, ps.items_num, ps.avg_price, ps.min_price, ps.max_price,
+                   ROW_NUMBER() OVER (PARTITION BY ps.sku_id, ps.region_id ORDER BY ps.bucket_ts DESC) AS rn
+            FROM price_stats AS ps
+            WHERE ps.region_id IS NOT NULL
+        ) AS t
+        WHERE t.rn = 1
+        ON CONFLICT (sku_id, region_id)
+        DO UPDATE SET
+            bucket_ts = EXCLUDED.bucket_ts,
+            items_num = EXCLUDED.items_num,
+            avg_price = EXCLUDED.avg_price,
+            min_price = EXCLUDED.min_price,
+            max_price = EXCLUDED.max_price
+        WHERE price_stats_latest.bucket_ts <= EXCLUDED.bucket_ts;
+    """)
+    res = await session.execute(sql)
+    logger.info("price_stats_latest 업서트 완료")
+    return res.rowcount if res.rowcount is not None else 0
+
+
 # ------------------------------------------------------------------------------
 # Pipeline entrypoint
 # ------------------------------------------------------------------------------
@@ -295,6 +349,7 @@ async def run_pipeline(session: AsyncSession, ensure_sku_limit: Optional[int] =
     전체 파이프라인 실행:
       1) SKU 미지정 item에 대한 SKU 생성/매핑
       2) 판매중만 대상으로 price_stats 집계 업서트
+      3) (sku, region)별 최신 버킷을 price_stats_latest에 반영
 
     Args:
         session: AsyncSession (FastAPI DI 또는 수동 생성)
@@ -311,5 +366,11 @@ async def run_pipeline(session: AsyncSession, ensure_sku_limit: Optional[int] =
     affected = await refresh_price_stats(session, StatsOptions(bucket=bucket, timezone=timezone))
     logger.info("price_stats 업서트 완료(추정 rowcount=%s)", affected)
 
+    # 3) 최신 버킷 포인터 갱신
+    await refresh_price_stats_latest(session)
+
     await session.commit()
+    # SKU가 새로 생겼거나 매핑이 바뀌었으면 이 프로세스의 (product, spec) → sku_id 캐시를 비움
+    if cnt:
+        invalidate_sku_cache()
     logger.info("=== SKU/Stats 파이프라인 종료 ===")
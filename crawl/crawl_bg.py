@@ -11,10 +11,9 @@
 - 번개장터 검색 API 직접 호출 (Playwright 불필요)
 - '끌어올리기'에 대응하는 '인내심' 기반 증분 수집 로직 적용
 """
-import asyncio, csv, json, os, random, re, signal, httpx
+import asyncio, csv, json, os, random, re, signal, httpx, orjson
 from datetime import datetime, timezone
 from typing import List, Tuple, Dict, Optional, Set
-from urllib.parse import quote
 
 # --- 설정 ---
 CATEGORY_MAP: Dict[str, int] = {"아이폰": 1, "아이패드": 2, "맥북": 3, "애플워치": 4, "에어팟": 5}
@@ -222,7 +221,7 @@ def parse_location(loc_text: str) -> Tuple[str, str, str]:
 
 # --- 핵심 크롤링 로직 ---
 # process_item 함수는 이제 새로 발견된 아이템인지 여부를 True/False로 반환합니다.
-async def process_item(item: Dict, category_id: int, _seen_pids: Set[str]) -> bool:
+async def process_item(item: Dict, category_id: int, _seen_pids: Set[str], crawled_at: str) -> bool:
     external_id = item.get("pid")
     if not external_id: # ID가 없으면 처리 불가
         return False 
@@ -272,7 +271,7 @@ async def process_item(item: Dict, category_id: int, _seen_pids: Set[str]) -> bo
         "sd": sd, "sgg": sgg, "emd": emd,
         "posted_at": posted_at or "",
         "posted_updated_at": "",
-        "last_crawled_at": datetime.now(timezone.utc).isoformat().replace("+00:00","Z")
+        "last_crawled_at": crawled_at
     }
     await append_row(row) 
     _seen_pids.add(external_id) # 새로 저장했으니 seen_pids에 추가
@@ -301,7 +300,7 @@ async def fetch_and_process_page(session: httpx.AsyncClient, query: str, categor
         try:
             resp = await session.get(API_BASE_URL, params=params, timeout=20)
             resp.raise_for_status()
-            data = resp.json()
+            data = orjson.loads(resp.content)
 
             if data.get("result") != "success" or not data.get("list"):
                 print(f"  [{query}] Page {page_num}: No items found or API error, or no list.")
@@ -312,9 +311,12 @@ async def fetch_and_process_page(session: httpx.AsyncClient, query: str, categor
                 print(f"  [{query}] Page {page_num}: No items on this page.")
                 return 0, True # 빈 페이지, 중단 신호
 
+            # 수집 시각은 페이지 단위로 한 번만 계산
+            crawled_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
             # 이 페이지의 아이템들을 처리하면서 newly_processed_on_page_count와 current_consecutive_seen_count를 계산
             for item in items: # gather를 사용하지 않고 순차적으로 처리하여 consecutive_seen_count를 정확히 계산
-                is_new_item = await process_item(item, category_id, _seen_pids)
+                is_new_item = await process_item(item, category_id, _seen_pids, crawled_at)
                 if is_new_item: # 새로운 아이템을 발견
                     newly_processed_on_page_count += 1
                     current_consecutive_seen_count = 0 # 새로운 아이템을 만났으므로 카운트 리셋
@@ -413,4 +415,9 @@ async def main():
     print("\nCrawling finished.")
 
 if __name__ == "__main__":
+    try:
+        import uvloop  # 리눅스/맥에서만 설치됨. 없으면 기본 이벤트 루프 사용
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file
@@ -12,25 +12,43 @@
 - 카테고리별 가격 절대값 가드 (초기 데이터 수집 안정화)
 - (선택) baseline 또는 러닝 평균 기반 외도 필터
 """
-import asyncio, csv, json, os, random, re, signal
+import asyncio, csv, json, os, random, re, signal, time
+try: import fcntl  # POSIX 전용 - 없으면 프로필 슬롯 락 대신 프로세스별 디렉터리
+except ImportError: fcntl=None
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import List, Tuple, Dict, Optional
-from urllib.parse import urljoin, urlparse, parse_qs, unquote, quote
+from urllib.parse import urlparse, parse_qs, unquote, quote
+from aiolimiter import AsyncLimiter
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 
 CATEGORY_MAP: Dict[str, int] = {"아이폰":1,"아이패드":2,"맥북":3,"애플워치":4,"에어팟":5}
 IPHONE, IPAD, MACBOOK, WATCH, AIRPODS = (CATEGORY_MAP["아이폰"], CATEGORY_MAP["아이패드"],
                                             CATEGORY_MAP["맥북"], CATEGORY_MAP["애플워치"], CATEGORY_MAP["에어팟"])
-CONCURRENCY=4; MAX_SCROLL_ROUNDS=1; SCROLL_PAUSE=(0.6,1.0); MAX_PAGES=30
+CONCURRENCY=4; MAX_SCROLL_ROUNDS=1; SCROLL_PAUSE=(0.6,1.0); MAX_PAGES=30; FALLBACK_PAGE_BUDGET_S=8.0
 OUTPUT_CSV="items_raw.csv"; CHECKPOINT="checkpoint.json"; BASELINE_JSON="price_baseline.json"
 ENABLE_TITLE_FILTER=True; ENABLE_PRICE_GUARD=True; ENABLE_PRICE_FILTER=False
-HEADLESS=True
+HEADLESS=True; PW_CACHE_ROOT=os.environ.get("PW_CACHE_ROOT", "./.pw-cache"); PW_PROFILE_SLOTS=8; CONTEXT_RECYCLE_PAGES=500
+CHROMIUM_ARGS=["--disable-blink-features=AutomationControlled","--disable-dev-shm-usage","--disable-extensions",
+               "--disable-background-networking","--disable-sync","--disable-translate","--metrics-recording-only"]
+VIEWPORT={"width":1280,"height":800}
+DETAIL_RATE_LIMITER=AsyncLimiter(10, 1)  # 상세 페이지 요청 초당 10건 (요청마다 랜덤 sleep 대신)
 USER_AGENT=("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
             "(KHTML, like Gecko) Chrome/140 Safari/537.36")
 BASE="https://www.daangn.com"
 LIST_LINK_SELECTOR='div[data-gtm="search_article"] a'
 PRIORITY_SELECTORS=['a[data-gtm="search_article"]',"a[href*='/articles/']"]
-TITLE_SELECTORS=["h1"]; PRICE_SELECTORS=["h3"]; TIME_SELECTORS=["time[datetime]","time"]
+DETAIL_FIELDS_JS="""() => {
+  const txt = (sel) => (document.querySelector(sel)?.innerText || '').trim();
+  const dt = (document.querySelector('time[datetime]')?.getAttribute('datetime') || '').trim();
+  return {title: txt('h1'), price: txt('h3'), posted: dt || txt('time[datetime]') || txt('time')};
+}"""
+HREFS_JS="els => els.map(e => e.href).filter(Boolean)"
+MORE_BUTTON_SELECTORS=["button:has-text('더보기')","button:has-text('더 불러오기')",
+                       "a.load-more",".load-more","button.load-more","button#more","a[role='button']"]
+ARTICLE_LINK_SELECTOR="a[href*='/articles/']"; DONG_LINK_SELECTOR="a[href*='?in=']"; SELECTOR_WAIT_MS=3000
+BLOCKED_RESOURCE_TYPES=frozenset({"image","stylesheet","font","media"})
+BLOCKED_URL_PAT=re.compile(r"google-analytics|googletagmanager|doubleclick|facebook\.net|hotjar")
 SEOUL_GU=["종로구","중구","용산구","성동구","광진구","동대문구","중랑구","성북구","강북구","도봉구","노원구",
           "은평구","서대문구","마포구","양천구","강서구","구로구","금천구","영등포구","동작구","관악구",
           "서초구","강남구","송파구","강동구"]
@@ -48,7 +66,9 @@ def price_is_ridiculous(category_id:int, price:Optional[int])->bool:
     g=CATEGORY_PRICE_GUARD.get(category_id); 
     return False if not g else not (g["min"]<=price<=g["max"])
 
-def _norm(s:str)->str: return re.sub(r"\s+","",(s or "")).lower()
+WS_RE=re.compile(r"\s+"); ISO_PREFIX_RE=re.compile(r"^\d{4}-\d{2}-\d{2}T"); NON_DIGIT_RE=re.compile(r"[^\d]")
+qquote=lru_cache(maxsize=1024)(quote)  # 시/구/키워드 퍼센트 인코딩 캐시
+def _norm(s:str)->str: return WS_RE.sub("",(s or "")).lower()
 def _contains_any(text:str, kws:List[str])->bool:
     t=_norm(text); return any(_norm(k) in t for k in kws)
 
@@ -100,7 +120,7 @@ def is_buying_or_service_title(title: str) -> bool:
     """True면 매입/구매/수요/수리/서비스성 광고로 간주(제외)"""
     if not title:
         return False
-    t = re.sub(r"\s+","",title.lower())
+    t = WS_RE.sub("",title.lower())
     return any(k.replace(" ","") in t for k in BUYING_HINTS) or any(k.replace(" ","") in t for k in SERVICE_HINTS)
 
 
@@ -169,10 +189,10 @@ async def save_checkpoint(data:dict):
 def to_iso_utc_now()->str: return datetime.now(timezone.utc).isoformat().replace("+00:00","Z")
 def to_iso_utc(dt_text:str)->Optional[str]:
     if not dt_text: return None
-    return dt_text if re.match(r"^\d{4}-\d{2}-\d{2}T",dt_text) else None
+    return dt_text if ISO_PREFIX_RE.match(dt_text) else None
 def parse_price_int(price_text:str)->Optional[int]:
     if not price_text: return None
-    digits=re.sub(r"[^\d]","",price_text)
+    digits=NON_DIGIT_RE.sub("",price_text)
     if digits=="": return None
     try: return int(digits)
     except ValueError: return None
@@ -180,7 +200,7 @@ def parse_price_int(price_text:str)->Optional[int]:
 ARTICLE_NUM_RE = re.compile(r"/articles/(\d+)")
 BUYSELL_SLUG_ID_RE = re.compile(r"/kr/buy-sell/[^/?#]*-([a-z0-9]{6,})", re.IGNORECASE)
 def extract_external_id_url(url: str) -> Optional[str]:
-    m = re.search(r"/articles/(\d+)", url)
+    m = ARTICLE_NUM_RE.search(url)
     if m:
         return m.group(1)
     m2 = BUYSELL_SLUG_ID_RE.search(url)
@@ -188,61 +208,38 @@ def extract_external_id_url(url: str) -> Optional[str]:
         return m2.group(1)
     return None
 
-async def try_selectors_get_text(page, selectors:List[str])->str:
-    for sel in selectors:
-        try:
-            el=await page.query_selector(sel)
-            if el:
-                txt=(await el.inner_text()).strip()
-                if txt: return txt
-        except Exception: pass
-    return ""
-
-async def try_get_time_attr(page)->str:
-    try:
-        el=await page.query_selector("time[datetime]")
-        if el:
-            dt=await el.get_attribute("datetime")
-            if dt: return dt.strip()
-    except Exception: pass
-    return await try_selectors_get_text(page, TIME_SELECTORS)
-
 async def extract_dong_inparams_from_gu(page, gu_name:str)->List[Tuple[str,str]]:
-    anchors=await page.query_selector_all("a[href*='/kr/buy-sell'], a[href*='?in=']")
+    hrefs=await eval_hrefs(page, "a[href*='/kr/buy-sell'], a[href*='?in=']")
     seen={}
-    for a in anchors:
-        href=await a.get_attribute("href")
-        if not href: continue
-        abs_href=urljoin(BASE,href) if href.startswith("/") or not href.startswith("http") else href
+    for abs_href in dict.fromkeys(hrefs):
         parsed=urlparse(abs_href); qs=parse_qs(parsed.query)
         in_vals=qs.get("in") or qs.get("in[]") or []
         if not in_vals: continue
         in_param=in_vals[0]; 
         if not in_param: continue
         dong_name=unquote(in_param.split("-",1)[0]) if "-" in in_param else unquote(in_param)
-        if dong_name and dong_name not in seen: seen[dong_name]=in_param
-    return [(k,v) for k,v in seen.items()]
+        if dong_name: seen.setdefault(dong_name, in_param)
+    return list(seen.items())
+
+async def eval_hrefs(page, selector:str)->List[str]:
+    # CDP 왕복 1번으로 href 전부 가져옴 (element.href는 이미 절대 URL)
+    try: return await page.eval_on_selector_all(selector, HREFS_JS)
+    except Exception: return []
 
 async def collect_anchor_hrefs_from_page(page)->List[str]:
-    hrefs=[]
-    try:
-        els=await page.query_selector_all(LIST_LINK_SELECTOR)
-        for e in els:
-            h=await e.get_attribute("href")
-            if h: hrefs.append(urljoin(BASE,h) if h.startswith("/") or not h.startswith("http") else h)
-    except Exception: pass
+    hrefs=await eval_hrefs(page, LIST_LINK_SELECTOR)
     if not hrefs:
-        for sel in PRIORITY_SELECTORS:
-            try:
-                els=await page.query_selector_all(sel)
-                for e in els:
-                    h=await e.get_attribute("href")
-                    if h: hrefs.append(urljoin(BASE,h) if h.startswith("/") or not h.startswith("http") else h)
-            except Exception: continue
-    seen=set(); out=[]
-    for h in hrefs:
-        if h not in seen: seen.add(h); out.append(h)
-    return out
+        for sel in PRIORITY_SELECTORS: hrefs.extend(await eval_hrefs(page, sel))
+    return list(dict.fromkeys(hrefs))
+
+async def wait_for(page, selector:str, timeout:int=SELECTOR_WAIT_MS)->bool:
+    # networkidle 대신 필요한 요소만 기다림 (없으면 그냥 진행)
+    try: await page.wait_for_selector(selector, timeout=timeout); return True
+    except PlaywrightTimeoutError: return False
+
+async def block_route(route, request):
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or BLOCKED_URL_PAT.search(request.url): await route.abort()
+    else: await route.continue_()
 
 async def extract_detail(context, url, city, gu, dong, category_id:int, semaphore):
     global stop_flag
@@ -250,17 +247,13 @@ async def extract_detail(context, url, city, gu, dong, category_id:int, semaphor
         if stop_flag: return
         page=await context.new_page()
         try:
-            async def route_handler(route, request):
-                if request.resource_type in ("image","stylesheet","font","media"):
-                    await route.abort()
-                else: await route.continue_()
-            await page.route("**/*", route_handler)
-            await page.goto(url, wait_until="networkidle", timeout=20000)
-            await asyncio.sleep(0.2+random.random()*0.4)
-
-            title=await try_selectors_get_text(page, TITLE_SELECTORS)
-            price_txt=await try_selectors_get_text(page, PRICE_SELECTORS)
-            posted_raw=await try_get_time_attr(page)
+            async with DETAIL_RATE_LIMITER:
+                await page.goto(url, wait_until="domcontentloaded", timeout=10000)
+            await wait_for(page, "h1", 2500)
+
+            # 제목/가격/시간을 evaluate 한 번으로 (셀렉터별 CDP 왕복 제거)
+            fields=await page.evaluate(DETAIL_FIELDS_JS)
+            title=fields["title"]; price_txt=fields["price"]; posted_raw=fields["posted"]
 
             # ----- 판매완료/예약중 판정 (h1 바로 이전 형제/그 내부) -----
             status="active"
@@ -336,7 +329,7 @@ async def extract_detail(context, url, city, gu, dong, category_id:int, semaphor
         except Exception as e:
             print("Detail exception:", e, url)
         finally:
-            await page.close(); await asyncio.sleep(0.12+random.random()*0.4)
+            await page.close()
 
 async def crawl_dong(context, city:str, gu:str, dong_name:str, in_param:str,
                      query:str, category_id:int, semaphore, checkpoint:dict):
@@ -345,25 +338,19 @@ async def crawl_dong(context, city:str, gu:str, dong_name:str, in_param:str,
     page=await context.new_page()
     try:
         if in_param:
-            base_region=f"{BASE}/kr/buy-sell/?in={quote(in_param)}"
+            base_region=f"{BASE}/kr/buy-sell/?in={qquote(in_param)}"
         else:
-            city_p=quote(city); gu_p=quote(gu); dong_p=quote(dong_name) if dong_name else ""
+            city_p=qquote(city); gu_p=qquote(gu); dong_p=qquote(dong_name) if dong_name else ""
             base_region=f"{BASE}/region/{city_p}/{gu_p}/{dong_p}" if dong_p else f"{BASE}/region/{city_p}/{gu_p}"
-        start_url=base_region + (("&search="+quote(query)) if query else "")
+        start_url=base_region + (("&search="+qquote(query)) if query else "")
         print(f"    [{query}] {gu}/{dong_name} -> {start_url}")
         try:
-            await page.goto(start_url, wait_until="networkidle", timeout=20000)
+            await page.goto(start_url, wait_until="domcontentloaded", timeout=10000)
         except PlaywrightTimeoutError:
             print("    목록타임아웃:", start_url); await page.close(); return
-
-        async def route_handler(route, request):
-            if request.resource_type in ("image","stylesheet","font","media"): await route.abort()
-            else: await route.continue_()
-        await page.route("**/*", route_handler)
+        await wait_for(page, ARTICLE_LINK_SELECTOR)
 
         collected=set(); detail_tasks=[]; no_new_rounds=0
-        MORE_BUTTON_SELECTORS=["button:has-text('더보기')","button:has-text('더 불러오기')",
-                               "a.load-more",".load-more","button.load-more","button#more","a[role='button']"]
 
         for rnd in range(MAX_SCROLL_ROUNDS):
             if stop_flag: break
@@ -401,17 +388,20 @@ async def crawl_dong(context, city:str, gu:str, dong_name:str, in_param:str,
             page_obj=await context.new_page()
             try:
                 print(f"      페일백: page=N 방식 시도 {gu}/{dong_name}")
-                collected2=set(collected); detail_tasks2=[]
+                collected2=set(collected); detail_tasks2=[]; t0=time.monotonic()
                 for pnum in range(1,MAX_PAGES+1):
                     if stop_flag: break
+                    if time.monotonic()-t0>FALLBACK_PAGE_BUDGET_S:
+                        print(f"        page=N 시간 예산 초과 ({FALLBACK_PAGE_BUDGET_S}s)"); break
                     qparts=[]; 
-                    if query: qparts.append(f"search={quote(query)}")
+                    if query: qparts.append(f"search={qquote(query)}")
                     qparts.append(f"page={pnum}")
                     page_url=base_region + ("&" if "?" in base_region else "?") + "&".join(qparts)
                     try:
-                        await page_obj.goto(page_url, wait_until="networkidle", timeout=15000)
+                        await page_obj.goto(page_url, wait_until="domcontentloaded", timeout=10000)
                     except PlaywrightTimeoutError:
                         print("        page timeout:", page_url); break
+                    await wait_for(page_obj, ARTICLE_LINK_SELECTOR)
                     hrefs=await collect_anchor_hrefs_from_page(page_obj)
                     new_found=0
                     for h in hrefs:
@@ -435,17 +425,53 @@ async def crawl_dong(context, city:str, gu:str, dong_name:str, in_param:str,
         try: await page.close()
         except Exception: pass
 
-async def crawl_all_seoul_for_query(context, query:str, category_id:int):
+class ContextPool:
+    """CONTEXT_RECYCLE_PAGES 페이지마다 컨텍스트를 새로 띄워 장시간 실행 시 Chromium 메모리 누수를 회수.
+       구 단위로만 교체하므로 진행 중인 페이지가 없는 시점에만 닫힌다."""
+    def __init__(self, p):
+        self.p=p; self.context=None; self.pages=0; self.user_data_dir=None; self._lock=None
+    def _count(self, _page): self.pages+=1
+    def _acquire_profile(self):
+        # PW_CACHE_ROOT/crawl_dg-0..N 중 다른 프로세스가 쓰지 않는 고정 프로필을 파일 락으로 독점
+        # (Chromium은 user-data-dir당 한 프로세스만 허용, 디렉터리는 남겨 실행 간 HTTP/JS 캐시 유지)
+        os.makedirs(PW_CACHE_ROOT, exist_ok=True)
+        if fcntl is None:
+            self.user_data_dir=os.path.join(PW_CACHE_ROOT, f"crawl_dg-pid{os.getpid()}"); return
+        for slot in range(PW_PROFILE_SLOTS):
+            f=open(os.path.join(PW_CACHE_ROOT, f"crawl_dg-{slot}.lock"), "w")
+            try: fcntl.flock(f, fcntl.LOCK_EX|fcntl.LOCK_NB)
+            except OSError: f.close(); continue
+            self._lock=f; self.user_data_dir=os.path.join(PW_CACHE_ROOT, f"crawl_dg-{slot}"); return
+        raise RuntimeError(f"사용 가능한 Playwright 프로필 없음 ({PW_CACHE_ROOT}, {PW_PROFILE_SLOTS}개 사용 중)")
+    async def get(self):
+        if self.context is None or self.pages>=CONTEXT_RECYCLE_PAGES:
+            if self.context is not None:
+                # 재생성 시에는 같은 프로필을 이어서 사용 (이전 컨텍스트를 먼저 닫음)
+                print(f"  컨텍스트 재생성 ({self.pages} pages)"); await self.context.close(); self.context=None
+            if self.user_data_dir is None: self._acquire_profile()
+            self.context=await self.p.chromium.launch_persistent_context(self.user_data_dir, headless=HEADLESS, user_agent=USER_AGENT,
+                                                                          args=CHROMIUM_ARGS, viewport=VIEWPORT)
+            await self.context.route("**/*", block_route)  # 컨텍스트에 한 번만 등록
+            self.context.on("page", self._count); self.pages=0
+        return self.context
+    async def close(self):
+        if self.context is not None: await self.context.close(); self.context=None
+        if self._lock is not None:
+            fcntl.flock(self._lock, fcntl.LOCK_UN); self._lock.close(); self._lock=None; self.user_data_dir=None
+
+async def crawl_all_seoul_for_query(ctx_pool:ContextPool, query:str, category_id:int):
     city="서울특별시"; checkpoint=load_checkpoint(); done_map=checkpoint.get(query,{})
     for gu in SEOUL_GU:
         if stop_flag: return
         print(f"[{query}] 구 접근:", gu)
+        context=await ctx_pool.get()
         page=await context.new_page()
         try:
-            gu_url=f"{BASE}/region/{quote(city)}/{quote(gu)}"
-            try: await page.goto(gu_url, wait_until="networkidle", timeout=20000)
+            gu_url=f"{BASE}/region/{qquote(city)}/{qquote(gu)}"
+            try: await page.goto(gu_url, wait_until="domcontentloaded", timeout=10000)
             except PlaywrightTimeoutError:
                 print("  구 페이지 타임아웃:", gu_url); await page.close(); continue
+            await wait_for(page, DONG_LINK_SELECTOR)
             dongs_info=await extract_dong_inparams_from_gu(page, gu)
             if not dongs_info:
                 print("  동 목록 자동추출 실패, 구 자체 페이지로 폴백:", gu); dongs_info=[(gu,None)]
@@ -477,14 +503,17 @@ def install_signal_handlers():
 
 async def main():
     load_baselines(); install_signal_handlers()
+    if hasattr(asyncio, "eager_task_factory"):  # Python 3.12+
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
     async with async_playwright() as p:
-        browser=await p.chromium.launch(headless=HEADLESS)
-        context=await browser.new_context(user_agent=USER_AGENT)
-        for query,category_id in CATEGORY_MAP.items():
-            if stop_flag: break
-            print(f"\n==== 키워드 시작: {query} (category_id={category_id}) ====")
-            await crawl_all_seoul_for_query(context, query, category_id)
-        await context.close(); await browser.close()
+        ctx_pool=ContextPool(p)
+        try:
+            for query,category_id in CATEGORY_MAP.items():
+                if stop_flag: break
+                print(f"\n==== 키워드 시작: {query} (category_id={category_id}) ====")
+                await crawl_all_seoul_for_query(ctx_pool, query, category_id)
+        finally:
+            await ctx_pool.close()
 
 if __name__=="__main__":
     asyncio.run(main())
@@ -73,8 +73,12 @@ def is_advertisement(title: str) -> bool:
 # 2. 액세서리 필터 관련 유틸
 ############################################################
 
+WS_RE = re.compile(r"\s+")
+NON_DIGIT_RE = re.compile(r"[^0-9]")
+
+
 def _norm(s: str) -> str:
-    return re.sub(r"\s+", "", (s or "")).lower()
+    return WS_RE.sub("", (s or "")).lower()
 
 
 def _contains_any(text: str, keywords: List[str]) -> bool:
@@ -305,7 +309,7 @@ def parse_joongna_search_html(
     """
     검색 결과 HTML 한 페이지 → 스펙에 맞는 dict 리스트.
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "lxml")
     items: List[Dict] = []
 
     grid = soup.select_one("ul.grid")
@@ -342,7 +346,7 @@ def parse_joongna_search_html(
         # 가격
         price_tag = li.select_one("div.font-semibold, p.text-gray-900, p[class*='price']")
         raw_price = price_tag.get_text(strip=True) if price_tag else ""
-        digits = re.sub(r"[^0-9]", "", raw_price)
+        digits = NON_DIGIT_RE.sub("", raw_price)
         price = int(digits) if digits else 0
 
         # 카테고리별 가격 가드
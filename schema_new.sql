@@ -124,6 +124,10 @@ CREATE INDEX idx_items_category_id ON items(category_id);
 CREATE INDEX idx_items_created_at ON items(created_at DESC);
 CREATE INDEX idx_items_category_created_at ON items(category_id, created_at DESC);
 CREATE INDEX idx_items_region_category_price ON items(region_id, category_id, price);
+-- 최저가 매물 조회 (sku + 상태 필터 후 가격순 top-N)
+CREATE INDEX idx_items_sku_status_price ON items(sku_id, status, price);
+-- 지역 지정 최저가 (sku + 상태 + 읍면동 필터 후 가격순 top-N)
+CREATE INDEX idx_items_sku_status_region_price ON items(sku_id, status, region_id, price);
 
 -- =========================================
 -- 7) 아이템 속성 값: item_attribute_values (EAV)
@@ -156,7 +160,10 @@ CREATE TABLE sku (
   category_id  INT NOT NULL REFERENCES category(category_id) ON DELETE RESTRICT,
 
   -- 속성 조합의 고유 식별자 (해시값 등)
-  fingerprint  VARCHAR(255) NOT NULL UNIQUE
+  fingerprint  VARCHAR(255) NOT NULL UNIQUE,
+
+  -- 표시용 모델명 (요약 조회 시 속성 조인 없이 사용)
+  display_name VARCHAR(255)
 );
 
 CREATE INDEX idx_sku_category_id ON sku(category_id);
@@ -209,6 +216,38 @@ CREATE INDEX idx_price_stats_sku_id ON price_stats(sku_id);
 CREATE INDEX idx_price_stats_region_id ON price_stats(region_id);
 CREATE INDEX idx_price_stats_bucket_ts ON price_stats(bucket_ts DESC);
 CREATE INDEX idx_price_stats_sku_region_bucket ON price_stats(sku_id, region_id, bucket_ts DESC);
+-- 지역 무관 가격 추이 (sku + 기간)
+CREATE INDEX idx_price_stats_sku_bucket ON price_stats(sku_id, bucket_ts DESC);
+
+-- =========================================
+-- 10-1) 최신 가격 통계: price_stats_latest
+--   (sku, region)별 가장 최근 버킷 1행 - 통계 적재 시 함께 갱신
+-- =========================================
+
+CREATE TABLE price_stats_latest (
+  sku_id       BIGINT NOT NULL REFERENCES sku(sku_id) ON DELETE CASCADE,
+  region_id    INT NOT NULL REFERENCES emd(region_id) ON DELETE CASCADE,
+
+  bucket_ts    TIMESTAMPTZ NOT NULL,
+  items_num    INT NOT NULL DEFAULT 0,
+  avg_price    NUMERIC(18,2),
+  min_price    INT,
+  max_price    INT,
+
+  PRIMARY KEY (sku_id, region_id)
+);
+
+-- 기존 price_stats로 초기 적재 (이후에는 SKU/통계 갱신 잡이 refresh_price_stats_latest로 유지)
+INSERT INTO price_stats_latest (sku_id, region_id, bucket_ts, items_num, avg_price, min_price, max_price)
+SELECT t.sku_id, t.region_id, t.bucket_ts, t.items_num, t.avg_price, t.min_price, t.max_price
+FROM (
+  SELECT ps.sku_id, ps.region_id, ps.bucket_ts, ps.items_num, ps.avg_price, ps.min_price, ps.max_price,
+         ROW_NUMBER() OVER (PARTITION BY ps.sku_id, ps.region_id ORDER BY ps.bucket_ts DESC) AS rn
+  FROM price_stats AS ps
+  WHERE ps.region_id IS NOT NULL
+) AS t
+WHERE t.rn = 1
+ON CONFLICT (sku_id, region_id) DO NOTHING;
 
 -- =========================================
 -- 트리거: updated_at 자동 업데이트